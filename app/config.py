@@ -23,6 +23,9 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     smtp_from_email: str = "noreply@leadblitz.co"
 
+    # Site fetching: conditional-request cache (defaults to ~/.cache/leadblitz)
+    http_cache_path: str = ""
+
     # Email enrichment
     hunter_api_key: str = ""
 
@@ -1,14 +1,24 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import get_settings
 
 
+def _json_dumps(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON columns (ScoreCache results, lead score breakdowns) are encoded and
+# decoded with orjson. psycopg2 decodes json values itself, using the
+# deserializer registered here.
 engine = create_engine(
     get_settings().database_url,
     pool_size=5,
     max_overflow=10,
     pool_pre_ping=True,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
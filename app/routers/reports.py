@@ -87,18 +87,20 @@ def download_pdf(
 
     data = _lead_data(lead)
 
+    import io
+    buffer = io.BytesIO()
     if report_type == "internal":
         report = generate_internal_report(data)
-        pdf_bytes = generate_internal_pdf(report)
+        generate_internal_pdf(report, out=buffer)
         filename = f"{lead.name}_internal_report.pdf"
     else:
         report = generate_client_report(data)
-        pdf_bytes = generate_client_pdf(report)
+        generate_client_pdf(report, out=buffer)
         filename = f"{lead.name}_audit_report.pdf"
 
-    import io
+    buffer.seek(0)
     return StreamingResponse(
-        io.BytesIO(pdf_bytes),
+        buffer,
         media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
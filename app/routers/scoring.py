@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from app.deps import get_db, get_current_user
 from app.config import get_settings
 from app.models import Lead, Campaign
-from app.services.scorer import score_website_hybrid
+from app.services.scorer import score_website_hybrid, get_cached_scores_bulk
 from app.services.technographics import classify_tech_health
 
 logger = logging.getLogger(__name__)
@@ -30,8 +30,12 @@ def _batch_score_worker(lead_ids: list[str], user_id: int, batch_id: str):
     status = _batch_status[batch_id]
 
     try:
+        leads = db.query(Lead).filter(Lead.id.in_(lead_ids), Lead.user_id == user_id).all()
+        leads_by_id = {l.id: l for l in leads}
+        cached_scores = get_cached_scores_bulk(db, [l.website for l in leads if l.website])
+
         for lid in lead_ids:
-            lead = db.query(Lead).filter(Lead.id == lid, Lead.user_id == user_id).first()
+            lead = leads_by_id.get(lid)
             if not lead or not lead.website:
                 status["skipped"] += 1
                 continue
@@ -45,7 +49,9 @@ def _batch_score_worker(lead_ids: list[str], user_id: int, batch_id: str):
                 return
 
             try:
-                result = score_website_hybrid(db=db, url=lead.website, api_key=settings.openai_api_key)
+                result = cached_scores.get(lead.website) or score_website_hybrid(
+                    db=db, url=lead.website, api_key=settings.openai_api_key,
+                )
                 lead.score = result.get("final_score", 0)
                 lead.heuristic_score = result.get("heuristic_score", 0)
                 lead.ai_score = result.get("ai_score", 0)
@@ -7,7 +7,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Optional
 
-import requests
+import httpx
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
@@ -16,6 +16,14 @@ from app.services.encryption import encrypt, decrypt
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP/2 client for the Google, Microsoft Graph and SendGrid APIs so
+# consecutive sends multiplex over one pooled TLS connection per host.
+_http = httpx.Client(
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=64),
+)
+
 
 class EmailProviderError(Exception):
     pass
@@ -32,7 +40,7 @@ def refresh_gmail_token(settings: EmailSettingsModel, db: Session) -> str:
     refresh_token = decrypt(settings.gmail_refresh_token)
     s = get_settings()
 
-    resp = requests.post("https://oauth2.googleapis.com/token", data={
+    resp = _http.post("https://oauth2.googleapis.com/token", data={
         "client_id": s.gmail_client_id,
         "client_secret": s.gmail_client_secret,
         "refresh_token": refresh_token,
@@ -64,7 +72,7 @@ def send_via_gmail(settings: EmailSettingsModel, to_email: str, subject: str, ht
     message.attach(MIMEText(html_body, "html"))
 
     raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-    resp = requests.post(
+    resp = _http.post(
         "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
         headers={"Authorization": f"Bearer {access_token}"},
         json={"raw": raw_message},
@@ -81,7 +89,7 @@ def refresh_outlook_token(settings: EmailSettingsModel, db: Session) -> str:
     refresh_token = decrypt(settings.outlook_refresh_token)
     s = get_settings()
 
-    resp = requests.post("https://login.microsoftonline.com/common/oauth2/v2.0/token", data={
+    resp = _http.post("https://login.microsoftonline.com/common/oauth2/v2.0/token", data={
         "client_id": s.outlook_client_id,
         "client_secret": s.outlook_client_secret,
         "refresh_token": refresh_token,
@@ -107,7 +115,7 @@ def send_via_outlook(settings: EmailSettingsModel, to_email: str, subject: str,
     else:
         access_token = decrypt(settings.outlook_access_token)
 
-    resp = requests.post(
+    resp = _http.post(
         "https://graph.microsoft.com/v1.0/me/sendMail",
         headers={"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"},
         json={"message": {
@@ -163,7 +171,7 @@ def send_via_sendgrid(settings: EmailSettingsModel, to_email: str, subject: str,
         raise EmailProviderError("SendGrid not properly configured")
 
     api_key = decrypt(settings.sendgrid_api_key_encrypted)
-    resp = requests.post(
+    resp = _http.post(
         "https://api.sendgrid.com/v3/mail/send",
         headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
         json={
@@ -235,7 +243,7 @@ def send_email_with_attachments_for_user(
         message = _build_mime_with_attachment(
             settings.gmail_email_address, to_email, subject, html_body, attachments)
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        resp = requests.post(
+        resp = _http.post(
             "https://gmail.googleapis.com/gmail/v1/users/me/messages/send",
             headers={"Authorization": f"Bearer {access_token}"},
             json={"raw": raw_message})
@@ -257,7 +265,7 @@ def send_email_with_attachments_for_user(
             }
             for att_bytes, att_filename, att_mime in attachments
         ]
-        resp = requests.post(
+        resp = _http.post(
             "https://graph.microsoft.com/v1.0/me/sendMail",
             headers={"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"},
             json={"message": {
@@ -295,7 +303,7 @@ def send_email_with_attachments_for_user(
             }
             for att_bytes, att_filename, att_mime in attachments
         ]
-        resp = requests.post(
+        resp = _http.post(
             "https://api.sendgrid.com/v3/mail/send",
             headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
             json={
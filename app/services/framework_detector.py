@@ -1,13 +1,20 @@
 """JS framework detection — near copy from original."""
 
 import re
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from bs4 import BeautifulSoup
 
+from app.services.html_analysis import ascii_lower, visible_strings
 
-def detect_js_framework(html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "html.parser")
+
+def _visible_word_count(soup: BeautifulSoup) -> int:
+    return sum(len(text.split()) for text in visible_strings(soup))
+
+
+def detect_js_framework(html: str, soup: Optional[BeautifulSoup] = None, html_lower: Optional[str] = None) -> Dict[str, Any]:
+    if soup is None:
+        soup = BeautifulSoup(html, "lxml")
     signals = []
     confidence_score = 0.0
     framework_hints = []
@@ -20,7 +27,8 @@ def detect_js_framework(html: str) -> Dict[str, Any]:
         "Gatsby": ["gatsby", "___gatsby", "gatsby-react-router"],
     }
 
-    html_lower = html.lower()
+    if html_lower is None:
+        html_lower = ascii_lower(html)
     for framework, sigs in framework_signatures.items():
         for sig in sigs:
             if sig.lower() in html_lower:
@@ -36,12 +44,8 @@ def detect_js_framework(html: str) -> Dict[str, Any]:
             confidence_score += 0.1
             break
 
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    visible_text = soup.get_text(separator=" ", strip=True)
-    text_word_count = len(visible_text.split())
+    text_word_count = _visible_word_count(soup)
 
-    soup = BeautifulSoup(html, "html.parser")
     scripts = soup.find_all("script")
     script_size = sum(len(s.get_text()) for s in scripts)
     html_size = len(html)
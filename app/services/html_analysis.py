@@ -0,0 +1,101 @@
+"""Parse a fetched page once and share the result across the scoring detectors."""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, NavigableString, PageElement, Tag
+
+_NON_NAVIGABLE_PREFIXES = ("#", "javascript:", "mailto:", "tel:")
+_NON_VISIBLE_TAGS = {"script", "style", "noscript"}
+
+
+def ascii_lower(html: str) -> str:
+    """Lowercase ASCII letters only, which is all the signature detectors match on.
+
+    ``str.lower`` falls off its ASCII fast path as soon as a page contains a
+    single curly quote or accented letter and becomes ~10x slower; folding
+    the UTF-8 bytes and decoding back stays fast for mixed pages.
+    """
+    if html.isascii():
+        return html.lower()
+    return html.encode("utf-8", "surrogatepass").lower().decode("utf-8", "surrogatepass")
+
+
+def analyze_html(html: str, final_url: str = "") -> Dict[str, Any]:
+    """Build the shared view consumed by framework, heuristic and tech detection.
+
+    The soup is treated as read-only by every consumer so it can be handed to
+    detectors running on different threads.
+    """
+    return {
+        "html": html,
+        "html_lower": ascii_lower(html),
+        "soup": BeautifulSoup(html, "lxml"),
+        "final_url": final_url,
+    }
+
+
+def _is_hidden(node: PageElement) -> bool:
+    return any(parent.name in _NON_VISIBLE_TAGS for parent in node.parents)
+
+
+def visible_strings(soup: Tag) -> Iterator[str]:
+    """Yield stripped, non-empty text outside script/style/noscript.
+
+    Unlike decomposing those tags first, this leaves a shared soup untouched.
+    """
+    for text in soup.find_all(string=True):
+        if type(text) is not NavigableString:
+            continue
+        if _is_hidden(text):
+            continue
+        stripped = text.strip()
+        if stripped:
+            yield stripped
+
+
+def visible_text(tag: Tag) -> str:
+    """``tag.get_text(strip=True)`` without text from script/style/noscript."""
+    return "".join(visible_strings(tag))
+
+
+def find_visible(soup: Tag, name: Any, limit: Optional[int] = None, **kwargs: Any) -> List[Tag]:
+    """``soup.find_all`` that skips matches nested in script/style/noscript."""
+    found: List[Tag] = []
+    for tag in soup.find_all(name, **kwargs):
+        if _is_hidden(tag):
+            continue
+        found.append(tag)
+        if limit is not None and len(found) >= limit:
+            break
+    return found
+
+
+def scan_anchors(soup: BeautifulSoup, base_url: str = "") -> Dict[str, Any]:
+    """Walk every <a> once and collect what the link-based detectors need.
+
+    ``link_texts`` holds the stripped text of each anchor that has any.
+    ``internal_links`` holds ``(full_url, href_lower, text_lower)`` for each
+    same-site, navigable href relative to ``base_url``, in document order.
+    An empty href resolves to ``base_url`` itself, and with no ``base_url``
+    every relative href counts as same-site.
+    """
+    link_texts: List[str] = []
+    internal_links: List[Tuple[str, str, str]] = []
+    base_domain = urlparse(base_url).netloc.replace("www.", "")
+
+    for link in soup.find_all("a"):
+        text = link.get_text(strip=True)
+        if text:
+            link_texts.append(text)
+        href = link.get("href")
+        if href is None:
+            continue
+        if href.startswith(_NON_NAVIGABLE_PREFIXES):
+            continue
+        full_url = urljoin(base_url, href)
+        if urlparse(full_url).netloc.replace("www.", "") != base_domain:
+            continue
+        internal_links.append((full_url, href.lower(), text.lower()))
+
+    return {"link_texts": link_texts, "internal_links": internal_links}
@@ -1,12 +1,15 @@
+import copy
 import io
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
@@ -24,53 +27,114 @@ GRAY = colors.HexColor("#6b7280")
 LIGHT_GRAY = colors.HexColor("#e5e7eb")
 WHITE = colors.white
 BG_CARD = colors.HexColor("#f9fafb")
-
-
-def _get_styles():
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle("ReportTitle", parent=styles["Title"], fontSize=22, textColor=DARK, spaceAfter=4, fontName="Helvetica-Bold", alignment=TA_CENTER))
-    styles.add(ParagraphStyle("ReportSubtitle", parent=styles["Normal"], fontSize=11, textColor=GRAY, spaceAfter=20, alignment=TA_CENTER))
-    styles.add(ParagraphStyle("SectionHeader", parent=styles["Heading2"], fontSize=14, textColor=DARK, spaceBefore=16, spaceAfter=8, fontName="Helvetica-Bold"))
-    styles.add(ParagraphStyle("BodyText2", parent=styles["Normal"], fontSize=10, textColor=DARK, leading=15, spaceAfter=6))
-    styles.add(ParagraphStyle("SmallGray", parent=styles["Normal"], fontSize=9, textColor=GRAY, leading=13))
-    styles.add(ParagraphStyle("BulletItem", parent=styles["Normal"], fontSize=10, textColor=DARK, leading=15, leftIndent=16, spaceAfter=4))
-    styles.add(ParagraphStyle("FindingTitle", parent=styles["Normal"], fontSize=11, textColor=DARK, fontName="Helvetica-Bold", spaceAfter=4))
-    styles.add(ParagraphStyle("StatusBadge", parent=styles["Normal"], fontSize=9, fontName="Helvetica-Bold", alignment=TA_RIGHT))
-    styles.add(ParagraphStyle("FooterText", parent=styles["Normal"], fontSize=8, textColor=GRAY, alignment=TA_CENTER))
-    return styles
+SCORE_GREEN = colors.HexColor("#22c55e")
+SCORE_ORANGE = colors.HexColor("#f97316")
+
+GREEN_HEX = GREEN.hexval()
+AMBER_HEX = AMBER.hexval()
+RED_HEX = RED.hexval()
+DARK_HEX = DARK.hexval()
+GRAY_HEX = GRAY.hexval()
+ACCENT_HEX = ACCENT.hexval()
+SCORE_GREEN_HEX = SCORE_GREEN.hexval()
+SCORE_ORANGE_HEX = SCORE_ORANGE.hexval()
+
+
+def _get_styles() -> Dict[str, ParagraphStyle]:
+    # Base styles mirror reportlab's sample sheet; only these three are used
+    # as parents, so the full sample sheet is not built.
+    normal = ParagraphStyle("Normal", fontName="Helvetica", fontSize=10, leading=12)
+    title = ParagraphStyle("Title", parent=normal, fontName="Helvetica-Bold", fontSize=18, leading=22, alignment=TA_CENTER, spaceAfter=6)
+    heading2 = ParagraphStyle("Heading2", parent=normal, fontName="Helvetica-Bold", fontSize=14, leading=18, spaceBefore=12, spaceAfter=6)
+    return {
+        "ReportTitle": ParagraphStyle("ReportTitle", parent=title, fontSize=22, textColor=DARK, spaceAfter=4, fontName="Helvetica-Bold", alignment=TA_CENTER),
+        "ReportSubtitle": ParagraphStyle("ReportSubtitle", parent=normal, fontSize=11, textColor=GRAY, spaceAfter=20, alignment=TA_CENTER),
+        "SectionHeader": ParagraphStyle("SectionHeader", parent=heading2, fontSize=14, textColor=DARK, spaceBefore=16, spaceAfter=8, fontName="Helvetica-Bold"),
+        "BodyText2": ParagraphStyle("BodyText2", parent=normal, fontSize=10, textColor=DARK, leading=15, spaceAfter=6),
+        "SmallGray": ParagraphStyle("SmallGray", parent=normal, fontSize=9, textColor=GRAY, leading=13),
+        "BulletItem": ParagraphStyle("BulletItem", parent=normal, fontSize=10, textColor=DARK, leading=15, leftIndent=16, spaceAfter=4),
+        "FindingTitle": ParagraphStyle("FindingTitle", parent=normal, fontSize=11, textColor=DARK, fontName="Helvetica-Bold", spaceAfter=4),
+        "StatusBadge": ParagraphStyle("StatusBadge", parent=normal, fontSize=9, fontName="Helvetica-Bold", alignment=TA_RIGHT),
+        "FooterText": ParagraphStyle("FooterText", parent=normal, fontSize=8, textColor=GRAY, alignment=TA_CENTER),
+    }
+
+
+# Styles are only read while flowables are laid out, so one set is shared by
+# every PDF instead of being rebuilt per call.
+_STYLES = _get_styles()
+
+# Paragraphs whose markup never changes are parsed once here.
+_STATIC_PARA = {
+    "client_title": Paragraph("Website Audit Report", _STYLES["ReportTitle"]),
+    "internal_title": Paragraph("Internal Lead Report", _STYLES["ReportTitle"]),
+    "overall_score": Paragraph('<font size="9" color="#6b7280">Overall Score</font>', _STYLES["SmallGray"]),
+    "grade": Paragraph('<font size="9" color="#6b7280">Grade</font>', _STYLES["SmallGray"]),
+    "client_footer": Paragraph("This report was generated automatically based on publicly available website data.", _STYLES["FooterText"]),
+}
+
+
+def _static_para(key: str) -> Paragraph:
+    # Flowables keep layout state from wrap(), so each document gets its own
+    # shallow copy; the parsed fragments are shared.
+    return copy.copy(_STATIC_PARA[key])
+
+
+# Bullet markup templates, filled with %-formatting: (colour hex, text...).
+_CHECK_TMPL = '<font color="%s">&#10004;</font> %s'
+_CROSS_TMPL = '<font color="%s">&#10060;</font> %s'
+_CROSS_LABEL_TMPL = '<font color="%s">&#10060;</font> <b>%s</b>: %s'
+_TH_TMPL = '<font color="%s">&#9679;</font> <b>%s</b> %s'
+_PRIORITY_TMPL = '<font color="%s"><b>%d.</b></font> %s'
+
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
 
 
 def _safe(text: str) -> str:
     if not text:
         return ""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    if "&" not in text and "<" not in text and ">" not in text:
+        return text
+    return text.translate(_HTML_ESCAPE)
+
+
+# 0-100 lookup tables for score colour and letter grade.
+_SCORE_COLOR_LUT = tuple(
+    (RED, RED_HEX) if s < 20
+    else (SCORE_ORANGE, SCORE_ORANGE_HEX) if s < 40
+    else (AMBER, AMBER_HEX) if s < 60
+    else (SCORE_GREEN, SCORE_GREEN_HEX) if s < 80
+    else (GREEN, GREEN_HEX)
+    for s in range(101)
+)
+_GRADE_LUT = tuple("F" * 20 + "D" * 20 + "C" * 20 + "B" * 20 + "A" * 21)
 
 
 def _score_color(score: int):
-    if score >= 80: return GREEN
-    if score >= 60: return colors.HexColor("#22c55e")
-    if score >= 40: return AMBER
-    if score >= 20: return colors.HexColor("#f97316")
-    return RED
+    """Return ``(color, hex_str)`` for a 0-100 score."""
+    return _SCORE_COLOR_LUT[max(0, min(100, int(score)))]
 
 
 def _grade_from_score(score: int) -> str:
-    if score >= 80: return "A"
-    if score >= 60: return "B"
-    if score >= 40: return "C"
-    if score >= 20: return "D"
-    return "F"
+    return _GRADE_LUT[max(0, min(100, int(score)))]
+
+
+_STATUS_COLORS = {
+    "good": (GREEN, GREEN_HEX),
+    "needs_attention": (AMBER, AMBER_HEX),
+    "critical": (RED, RED_HEX),
+}
 
 
 def _status_color(status: str):
-    return {"good": GREEN, "needs_attention": AMBER, "critical": RED}.get(status, GRAY)
+    """Return ``(color, hex_str)`` for a finding status."""
+    return _STATUS_COLORS.get(status, (GRAY, GRAY_HEX))
 
 
 def _status_label(status: str) -> str:
     return {"good": "Good", "needs_attention": "Needs Attention", "critical": "Critical"}.get(status, "Unknown")
 
 
-def _header_footer(canvas, doc, title_text="Website Audit Report", agency_name=""):
+def _header_footer(canvas, doc, title_text="Website Audit Report", agency_name="", date_str=""):
     canvas.saveState()
     canvas.setFont("Helvetica", 8)
     canvas.setFillColor(GRAY)
@@ -78,21 +142,21 @@ def _header_footer(canvas, doc, title_text="Website Audit Report", agency_name="
     canvas.drawRightString(doc.width + doc.leftMargin, doc.height + doc.topMargin + 12, title_text)
     canvas.setStrokeColor(LIGHT_GRAY)
     canvas.line(doc.leftMargin, doc.height + doc.topMargin + 8, doc.width + doc.leftMargin, doc.height + doc.topMargin + 8)
-    canvas.drawString(doc.leftMargin, 25, f"Generated {datetime.now().strftime('%B %d, %Y')}")
+    canvas.drawString(doc.leftMargin, 25, f"Generated {date_str or datetime.now().strftime('%B %d, %Y')}")
     canvas.drawRightString(doc.width + doc.leftMargin, 25, f"Page {doc.page}")
     canvas.restoreState()
 
 
 def _build_score_table(score: int, grade: str, styles):
-    sc = _score_color(score)
+    _, sc_hex = _score_color(score)
     data = [
         [
-            Paragraph(f'<font size="28" color="{sc.hexval()}">{score}</font><font size="14" color="{GRAY.hexval()}">/100</font>', styles["BodyText2"]),
-            Paragraph(f'<font size="28" color="{sc.hexval()}">{grade}</font>', styles["BodyText2"]),
+            Paragraph(f'<font size="28" color="{sc_hex}">{score}</font><font size="14" color="{GRAY_HEX}">/100</font>', styles["BodyText2"]),
+            Paragraph(f'<font size="28" color="{sc_hex}">{grade}</font>', styles["BodyText2"]),
         ],
         [
-            Paragraph('<font size="9" color="#6b7280">Overall Score</font>', styles["SmallGray"]),
-            Paragraph('<font size="9" color="#6b7280">Grade</font>', styles["SmallGray"]),
+            _static_para("overall_score"),
+            _static_para("grade"),
         ],
     ]
     t = Table(data, colWidths=[2.5 * inch, 2.5 * inch])
@@ -109,13 +173,13 @@ def _build_score_table(score: int, grade: str, styles):
 
 def _build_finding_block(section: Dict, styles) -> list:
     status = section.get("status", "needs_attention")
-    sc = _status_color(status)
+    sc, sc_hex = _status_color(status)
     label = _status_label(status)
 
     elements = []
     title_row = Table(
         [[Paragraph(f'<b>{_safe(section.get("title", ""))}</b>', styles["FindingTitle"]),
-          Paragraph(f'<font color="{sc.hexval()}">[{label}]</font>', styles["StatusBadge"])]],
+          Paragraph(f'<font color="{sc_hex}">[{label}]</font>', styles["StatusBadge"])]],
         colWidths=[4 * inch, 1.8 * inch],
     )
     title_row.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "MIDDLE")]))
@@ -129,7 +193,7 @@ def _build_finding_block(section: Dict, styles) -> list:
         elements.append(Paragraph(f'<font color="#6b7280"><b>Why it matters:</b> {_safe(impact)}</font>', styles["SmallGray"]))
     rec = section.get("recommendation", "")
     if rec:
-        elements.append(Paragraph(f'<font color="{ACCENT.hexval()}"><b>Recommendation:</b> {_safe(rec)}</font>', styles["BodyText2"]))
+        elements.append(Paragraph(f'<font color="{ACCENT_HEX}"><b>Recommendation:</b> {_safe(rec)}</font>', styles["BodyText2"]))
 
     elements.append(Spacer(1, 4))
     wrapper = Table([[elements]], colWidths=[5.8 * inch])
@@ -146,9 +210,22 @@ def _build_finding_block(section: Dict, styles) -> list:
     return [wrapper, Spacer(1, 8)]
 
 
-def generate_client_pdf(report_data: Dict[str, Any]) -> bytes:
-    buffer = io.BytesIO()
-    styles = _get_styles()
+def _weakness_bullet(w: Any, style) -> Paragraph:
+    if isinstance(w, dict):
+        return Paragraph(_CROSS_LABEL_TMPL % (RED_HEX, _safe(w.get("label", "")), _safe(w.get("detail", ""))), style)
+    return Paragraph(_CROSS_TMPL % (RED_HEX, _safe(str(w))), style)
+
+
+def _tech_health_bullet(item: Any, hex_str: str, style) -> Paragraph:
+    lbl = item.get("label", "") if isinstance(item, dict) else str(item)
+    detail = item.get("detail", "") if isinstance(item, dict) else ""
+    return Paragraph(_TH_TMPL % (hex_str, _safe(lbl), _safe(detail)), style)
+
+
+def generate_client_pdf(report_data: Dict[str, Any], out: Optional[BinaryIO] = None) -> Optional[bytes]:
+    """Render the PDF and return its bytes, or write it to *out* and return None."""
+    buffer = out if out is not None else io.BytesIO()
+    styles = _STYLES
 
     business_name = report_data.get("business_name", "Business")
     website = report_data.get("website", "")
@@ -163,7 +240,7 @@ def generate_client_pdf(report_data: Dict[str, Any]) -> bytes:
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.8 * inch, bottomMargin=0.6 * inch, leftMargin=0.75 * inch, rightMargin=0.75 * inch)
     story = []
 
-    story.append(Paragraph("Website Audit Report", styles["ReportTitle"]))
+    story.append(_static_para("client_title"))
     story.append(Paragraph(f'Prepared for <b>{_safe(business_name)}</b><br/><font size="9" color="#9ca3af">{_safe(website)}</font>', styles["ReportSubtitle"]))
     story.append(Spacer(1, 8))
     story.append(_build_score_table(score, grade, styles))
@@ -178,8 +255,7 @@ def generate_client_pdf(report_data: Dict[str, Any]) -> bytes:
 
     if positive_highlights:
         story.append(Paragraph("What You're Doing Well", styles["SectionHeader"]))
-        for h in positive_highlights:
-            story.append(Paragraph(f'<font color="{GREEN.hexval()}">&#10004;</font> {_safe(h)}', styles["BulletItem"]))
+        story.extend(Paragraph(_CHECK_TMPL % (GREEN_HEX, _safe(h)), styles["BulletItem"]) for h in positive_highlights)
         story.append(Spacer(1, 8))
 
     if sections:
@@ -190,22 +266,44 @@ def generate_client_pdf(report_data: Dict[str, Any]) -> bytes:
     if top_priorities:
         story.append(Spacer(1, 8))
         story.append(Paragraph("Top Priorities", styles["SectionHeader"]))
-        for i, p in enumerate(top_priorities, 1):
-            story.append(Paragraph(f'<font color="{DARK.hexval()}"><b>{i}.</b></font> {_safe(p)}', styles["BulletItem"]))
+        story.extend(
+            Paragraph(_PRIORITY_TMPL % (DARK_HEX, i, _safe(p)), styles["BulletItem"])
+            for i, p in enumerate(top_priorities, 1)
+        )
 
     story.append(Spacer(1, 20))
-    story.append(Paragraph("This report was generated automatically based on publicly available website data.", styles["FooterText"]))
+    story.append(_static_para("client_footer"))
+
+    date_str = datetime.now().strftime('%B %d, %Y')
 
     def on_page(canvas, doc_ref):
-        _header_footer(canvas, doc_ref, "Website Audit Report", agency_name)
+        _header_footer(canvas, doc_ref, "Website Audit Report", agency_name, date_str)
 
     doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    if out is not None:
+        return None
     return buffer.getvalue()
 
 
-def generate_internal_pdf(report_data: Dict[str, Any]) -> bytes:
-    buffer = io.BytesIO()
-    styles = _get_styles()
+def generate_client_pdfs_batch(reports: List[Dict[str, Any]], workers: Optional[int] = None) -> List[bytes]:
+    """Render several client PDFs in parallel worker processes.
+
+    reportlab layout is CPU-bound Python, so threads would serialise on the
+    GIL. Results are returned in the same order as *reports*.
+    """
+    if not reports:
+        return []
+    if len(reports) == 1:
+        return [generate_client_pdf(reports[0])]
+    max_workers = min(workers or os.cpu_count() or 1, len(reports))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(generate_client_pdf, reports))
+
+
+def generate_internal_pdf(report_data: Dict[str, Any], out: Optional[BinaryIO] = None) -> Optional[bytes]:
+    """Render the PDF and return its bytes, or write it to *out* and return None."""
+    buffer = out if out is not None else io.BytesIO()
+    styles = _STYLES
 
     business_name = report_data.get("business_name", "Business")
     website = report_data.get("website", "")
@@ -218,7 +316,7 @@ def generate_internal_pdf(report_data: Dict[str, Any]) -> bytes:
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.8 * inch, bottomMargin=0.6 * inch, leftMargin=0.75 * inch, rightMargin=0.75 * inch)
     story = []
 
-    story.append(Paragraph("Internal Lead Report", styles["ReportTitle"]))
+    story.append(_static_para("internal_title"))
     story.append(Paragraph(f'<b>{_safe(business_name)}</b><br/><font size="9" color="#9ca3af">{_safe(website)}</font>', styles["ReportSubtitle"]))
     story.append(Spacer(1, 8))
     story.append(_build_score_table(score, grade, styles))
@@ -254,42 +352,37 @@ def generate_internal_pdf(report_data: Dict[str, Any]) -> bytes:
     if report:
         if report.get("strengths"):
             story.append(Paragraph("Strengths", styles["SectionHeader"]))
-            for s_item in report["strengths"]:
-                story.append(Paragraph(f'<font color="{GREEN.hexval()}">&#10004;</font> {_safe(str(s_item))}', styles["BulletItem"]))
+            story.extend(
+                Paragraph(_CHECK_TMPL % (GREEN_HEX, _safe(str(s_item))), styles["BulletItem"])
+                for s_item in report["strengths"]
+            )
             story.append(Spacer(1, 6))
         if report.get("weaknesses"):
             story.append(Paragraph("Weaknesses", styles["SectionHeader"]))
-            for w in report["weaknesses"]:
-                if isinstance(w, dict):
-                    story.append(Paragraph(f'<font color="{RED.hexval()}">&#10060;</font> <b>{_safe(w.get("label", ""))}</b>: {_safe(w.get("detail", ""))}', styles["BulletItem"]))
-                else:
-                    story.append(Paragraph(f'<font color="{RED.hexval()}">&#10060;</font> {_safe(str(w))}', styles["BulletItem"]))
+            story.extend(_weakness_bullet(w, styles["BulletItem"]) for w in report["weaknesses"])
             story.append(Spacer(1, 6))
 
     if tech_health:
         has_items = any(tech_health.get(k) for k in ["green", "amber", "red"])
         if has_items:
             story.append(Paragraph("Technology Health", styles["SectionHeader"]))
-            for item in tech_health.get("green", []):
-                lbl = item.get("label", "") if isinstance(item, dict) else str(item)
-                detail = item.get("detail", "") if isinstance(item, dict) else ""
-                story.append(Paragraph(f'<font color="{GREEN.hexval()}">&#9679;</font> <b>{_safe(lbl)}</b> {_safe(detail)}', styles["BulletItem"]))
-            for item in tech_health.get("amber", []):
-                lbl = item.get("label", "") if isinstance(item, dict) else str(item)
-                detail = item.get("detail", "") if isinstance(item, dict) else ""
-                story.append(Paragraph(f'<font color="{AMBER.hexval()}">&#9679;</font> <b>{_safe(lbl)}</b> {_safe(detail)}', styles["BulletItem"]))
-            for item in tech_health.get("red", []):
-                lbl = item.get("label", "") if isinstance(item, dict) else str(item)
-                detail = item.get("detail", "") if isinstance(item, dict) else ""
-                story.append(Paragraph(f'<font color="{RED.hexval()}">&#9679;</font> <b>{_safe(lbl)}</b> {_safe(detail)}', styles["BulletItem"]))
+            for bucket, hex_str in (("green", GREEN_HEX), ("amber", AMBER_HEX), ("red", RED_HEX)):
+                story.extend(
+                    _tech_health_bullet(item, hex_str, styles["BulletItem"])
+                    for item in tech_health.get(bucket, [])
+                )
 
     story.append(Spacer(1, 16))
     story.append(HRFlowable(width="100%", thickness=0.5, color=LIGHT_GRAY))
     story.append(Spacer(1, 8))
     story.append(Paragraph(f"Internal report generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}. For internal use only.", styles["FooterText"]))
 
+    date_str = datetime.now().strftime('%B %d, %Y')
+
     def on_page(canvas, doc_ref):
-        _header_footer(canvas, doc_ref, "Internal Lead Report", "")
+        _header_footer(canvas, doc_ref, "Internal Lead Report", "", date_str)
 
     doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    if out is not None:
+        return None
     return buffer.getvalue()
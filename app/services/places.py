@@ -1,16 +1,43 @@
 """Google Places API — adapted from original, accepts api_key as param."""
 
 import logging
+import threading
 import time
 from typing import Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://maps.googleapis.com/maps/api/place"
 
+# Keep-alive pool for maps.googleapis.com, sized for the parallel detail lookups.
+# read=False re-raises read timeouts straight away, so a slow API still fails
+# after one timeout with requests' ReadTimeout instead of a wrapped
+# ConnectionError after several.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, read=False, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+_DETAIL_POOL: Optional[ThreadPoolExecutor] = None
+_DETAIL_POOL_LOCK = threading.Lock()
+
+
+def _get_detail_pool() -> ThreadPoolExecutor:
+    global _DETAIL_POOL
+    if _DETAIL_POOL is None:
+        with _DETAIL_POOL_LOCK:
+            if _DETAIL_POOL is None:
+                _DETAIL_POOL = ThreadPoolExecutor(max_workers=10, thread_name_prefix="places")
+    return _DETAIL_POOL
+
 
 def search_places(
     api_key: str,
@@ -32,9 +59,14 @@ def search_places(
 
     try:
         t0 = time.time()
-        response = requests.get(url, params=params, timeout=15)
+        response = _SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
+            # Reported like requests' own JSONDecodeError used to be, not as a
+            # bare ValueError carrying orjson's message.
+            raise ValueError(f"Network error: {exc}")
 
         status = data.get("status")
         if status == "REQUEST_DENIED":
@@ -52,18 +84,13 @@ def search_places(
         place_ids = [r["place_id"] for r in results if r.get("place_id")]
 
         places: List[Dict] = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(_get_details, pid, api_key): pid for pid in place_ids}
-            try:
-                for future in as_completed(futures, timeout=20):
-                    try:
-                        detail = future.result(timeout=5)
-                        if detail:
-                            places.append(detail)
-                    except Exception as exc:
-                        logger.warning("Place detail failed for %s: %s", futures[future], exc)
-            except TimeoutError:
-                logger.warning("Details deadline exceeded, returning %d partial results", len(places))
+        details = _get_detail_pool().map(lambda pid: _get_details(pid, api_key), place_ids, timeout=20)
+        try:
+            for detail in details:
+                if detail:
+                    places.append(detail)
+        except FuturesTimeoutError:
+            logger.warning("Details deadline exceeded, returning %d partial results", len(places))
 
         logger.info("Search '%s' returned %d places in %.1fs", query, len(places), time.time() - t0)
         return {"places": places, "next_page_token": next_page_token}
@@ -84,9 +111,9 @@ def _get_details(place_id: str, api_key: str) -> Optional[Dict]:
         "key": api_key,
     }
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = _SESSION.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         if data.get("status") != "OK":
             return None
         r = data.get("result", {})
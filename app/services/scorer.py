@@ -1,11 +1,14 @@
 """Hybrid scoring orchestrator — adapted from original, uses db session as param."""
 
+import functools
 import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse, urlunparse
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models import ScoreCache
@@ -13,6 +16,7 @@ from app.models import ScoreCache
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_url(url: str) -> str:
     if not url:
         return ""
@@ -25,25 +29,22 @@ def normalize_url(url: str) -> str:
     return urlunparse((parsed.scheme, netloc, parsed.path.rstrip("/") or "/", "", "", ""))
 
 
+@functools.lru_cache(maxsize=4096)
 def url_to_hash(url: str) -> str:
-    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+    # Cache key only, not a security boundary. Keeping SHA-256 leaves existing
+    # score_cache rows addressable.
+    return hashlib.sha256(url.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
-def get_cached_score(db: Session, url: str, max_age_hours: int = 24) -> Optional[Dict[str, Any]]:
-    normalized = normalize_url(url)
-    url_hash = url_to_hash(normalized)
-
-    entry = db.query(ScoreCache).filter(ScoreCache.url_hash == url_hash).first()
-    if not entry:
-        return None
-
+def _is_fresh(entry: ScoreCache, max_age_hours: int) -> bool:
     cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
     fetched = entry.fetched_at
     if fetched.tzinfo is None:
         fetched = fetched.replace(tzinfo=timezone.utc)
-    if fetched < cutoff:
-        return None
+    return fetched >= cutoff
+
 
+def _format_cached_entry(entry: ScoreCache) -> Dict[str, Any]:
     heuristic_data = entry.heuristic_result or {}
     ai_data = entry.ai_result or {}
     ai_scores = ai_data.get("category_scores", {})
@@ -66,35 +67,95 @@ def get_cached_score(db: Session, url: str, max_age_hours: int = 24) -> Optional
     }
 
 
-def save_score_to_cache(db: Session, url: str, score_data: Dict[str, Any]) -> None:
-    normalized = normalize_url(url)
+def get_cached_score(
+    db: Session, url: str, max_age_hours: int = 24, normalized: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    normalized = normalized or normalize_url(url)
     url_hash = url_to_hash(normalized)
 
     entry = db.query(ScoreCache).filter(ScoreCache.url_hash == url_hash).first()
-    if entry:
-        entry.heuristic_result = score_data.get("heuristic")
-        entry.ai_result = score_data.get("ai_review")
-        entry.final_score = score_data.get("final_score", 0)
-        entry.confidence = score_data.get("confidence", 0.5)
-        entry.fetched_at = datetime.now(timezone.utc)
-    else:
-        entry = ScoreCache(
-            url_hash=url_hash,
-            normalized_url=normalized,
-            heuristic_result=score_data.get("heuristic"),
-            ai_result=score_data.get("ai_review"),
-            final_score=score_data.get("final_score", 0),
-            confidence=score_data.get("confidence", 0.5),
-        )
-        db.add(entry)
+    if not entry or not _is_fresh(entry, max_age_hours):
+        return None
+    return _format_cached_entry(entry)
+
+
+def get_cached_scores_bulk(db: Session, urls: List[str], max_age_hours: int = 24) -> Dict[str, Dict[str, Any]]:
+    """Look up fresh cache entries for many URLs in one query.
+
+    Returns a dict keyed by the original URL; URLs without a fresh entry are
+    omitted.
+    """
+    hash_by_url = {url: url_to_hash(normalize_url(url)) for url in urls if url}
+    if not hash_by_url:
+        return {}
+
+    entries = db.query(ScoreCache).filter(ScoreCache.url_hash.in_(set(hash_by_url.values()))).all()
+    fresh = {e.url_hash: e for e in entries if _is_fresh(e, max_age_hours)}
+
+    return {
+        url: _format_cached_entry(fresh[url_hash])
+        for url, url_hash in hash_by_url.items()
+        if url_hash in fresh
+    }
+
+
+def save_score_to_cache(
+    db: Session, url: str, score_data: Dict[str, Any], normalized: Optional[str] = None,
+) -> None:
+    normalized = normalized or normalize_url(url)
+
+    stmt = pg_insert(ScoreCache).values(
+        url_hash=url_to_hash(normalized),
+        normalized_url=normalized,
+        heuristic_result=score_data.get("heuristic"),
+        ai_result=score_data.get("ai_review"),
+        final_score=score_data.get("final_score", 0),
+        confidence=score_data.get("confidence", 0.5),
+        fetched_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ScoreCache.url_hash],
+        set_={
+            "heuristic_result": stmt.excluded.heuristic_result,
+            "ai_result": stmt.excluded.ai_result,
+            "final_score": stmt.excluded.final_score,
+            "confidence": stmt.excluded.confidence,
+            "fetched_at": stmt.excluded.fetched_at,
+        },
+    )
 
     try:
+        db.execute(stmt)
         db.commit()
     except Exception:
         db.rollback()
         logger.exception("Failed to cache score for %s", url)
 
 
+MIN_SCORABLE_HTML = 500
+
+
+def _minimal_score_result(errors: List[str], observation: str, bot_blocked: bool = False) -> Dict[str, Any]:
+    return {
+        "final_score": 0,
+        "confidence": 0.3,
+        "heuristic_score": 0,
+        "ai_score": 0,
+        "breakdown": {},
+        "has_errors": True,
+        "errors": errors,
+        "rendering_limitations": True,
+        "bot_blocked": bot_blocked,
+        "plain_english_report": {
+            "strengths": ["Website has security measures in place"] if bot_blocked else [],
+            "weaknesses": [],
+            "technology_observations": observation,
+            "sales_opportunities": [],
+        },
+        "cached": False,
+    }
+
+
 def score_website_hybrid(db: Session, url: str, api_key: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Simplified scoring pipeline (no Playwright — v2 is static-only):
@@ -113,10 +174,13 @@ def score_website_hybrid(db: Session, url: str, api_key: str, use_cache: bool =
     from app.services.ai_scorer import score_with_ai, combine_scores
     from app.services.framework_detector import detect_js_framework, get_detection_summary
     from app.services.technographics import detect_technographics
+    from app.services.html_analysis import analyze_html
+
+    normalized = normalize_url(url)
 
     # 1. Cache check
     if use_cache:
-        cached = get_cached_score(db, url)
+        cached = get_cached_score(db, url, normalized=normalized)
         if cached:
             return cached
 
@@ -129,34 +193,39 @@ def score_website_hybrid(db: Session, url: str, api_key: str, use_cache: bool =
     is_blocked = fetch_status in [403, 401, 429]
 
     if not static_html or is_blocked:
-        return {
-            "final_score": 0,
-            "confidence": 0.3,
-            "heuristic_score": 0,
-            "ai_score": 0,
-            "breakdown": {},
-            "has_errors": True,
-            "errors": fetch_result.get("errors", []),
-            "rendering_limitations": True,
-            "bot_blocked": is_blocked,
-            "plain_english_report": {
-                "strengths": ["Website has security measures in place"] if is_blocked else [],
-                "weaknesses": [],
-                "technology_observations": "Unable to access website for analysis",
-                "sales_opportunities": [],
-            },
-            "cached": False,
-        }
-
-    # 3. Framework detection
-    detection = detect_js_framework(static_html)
-    logger.info("Framework detection for %s: %s", url, get_detection_summary(detection))
+        return _minimal_score_result(
+            fetch_result.get("errors", []),
+            bot_blocked=is_blocked,
+            observation="Unable to access website for analysis",
+        )
 
-    # 4. Heuristic scoring
-    heuristic = score_site_heuristics(static_html, final_url)
+    # A thin homepage (parked domain, placeholder) gives the scorers nothing to
+    # work with; skip the AI round-trip. The combined HTML carries page markers
+    # and follow-up pages, so gate on the homepage body itself.
+    homepage_html = fetch_result.get("pages", {}).get("homepage", {}).get("html", "")
+    if len(homepage_html.strip()) < MIN_SCORABLE_HTML:
+        return _minimal_score_result(
+            fetch_result.get("errors", []) + ["Page content too short to analyse"],
+            observation="Website returned too little content for analysis",
+        )
 
-    # 5. Technographics
-    technographics_data = detect_technographics(static_html, final_url)
+    # 3-5. Framework detection, heuristic scoring, technographics and AI
+    # content extraction only read static_html, so run them side by side on
+    # one shared parse of the page. AI scoring (6) waits for every result.
+    analysis = analyze_html(static_html, final_url)
+    soup, html_lower = analysis["soup"], analysis["html_lower"]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        detection_future = executor.submit(detect_js_framework, static_html, soup, html_lower)
+        heuristic_future = executor.submit(score_site_heuristics, static_html, final_url, soup)
+        technographics_future = executor.submit(
+            detect_technographics, static_html, final_url, None, soup, html_lower,
+        )
+        content_future = executor.submit(extract_site_content_for_ai, static_html, 6000, soup)
+        detection = detection_future.result()
+        heuristic = heuristic_future.result()
+        technographics_data = technographics_future.result()
+        site_content = content_future.result()
+    logger.info("Framework detection for %s: %s", url, get_detection_summary(detection))
 
     rendering_limitations = (
         heuristic.get("rendering_limitations", False)
@@ -164,7 +233,6 @@ def score_website_hybrid(db: Session, url: str, api_key: str, use_cache: bool =
     )
 
     # 6. AI scoring
-    site_content = extract_site_content_for_ai(static_html, max_chars=6000)
     ai_review = score_with_ai(
         api_key=api_key,
         site_content=site_content,
@@ -192,6 +260,6 @@ def score_website_hybrid(db: Session, url: str, api_key: str, use_cache: bool =
             "final_score": result["final_score"],
             "confidence": result["confidence"],
         }
-        save_score_to_cache(db, url, cache_data)
+        save_score_to_cache(db, url, cache_data, normalized=normalized)
 
     return result
@@ -1,148 +1,311 @@
 """HTTP fetch with retries — adapted from original, removed prints, added logging."""
 
+import functools
 import logging
+import os
 import random
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
-
-def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict[str, Any]:
-    user_agents = [
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
-    ]
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13))
+
+_USER_AGENTS = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+)
+
+_BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "cross-site",
+    "Sec-Fetch-User": "?1",
+    "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"Windows"',
+    "Cache-Control": "no-cache",
+    "Referer": "https://www.google.com/",
+}
+
+
+_FETCH_RETRIES = 3
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    # Connection errors, read timeouts and throttling responses are retried
+    # inside urllib3 on the pooled connection. TLS failures (other=0) go
+    # straight to the insecure fallback, Retry-After is ignored so a hostile
+    # header cannot park a worker, and once retries run out the last response
+    # is returned rather than raised.
+    retry = Retry(
+        total=_FETCH_RETRIES,
+        other=0,
+        backoff_factor=1.0,
+        status_forcelist=[429, 503, 504],
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared keep-alive pool so repeat fetches to a host skip the TCP/TLS handshake.
+_SESSION = _new_session()
+
+
+# Bodies larger than this are not worth keeping for a 304; the cap also bounds
+# the file size at roughly max_entries * _HTTP_CACHE_MAX_BODY.
+_HTTP_CACHE_MAX_BODY = 1_000_000
+_HTTP_CACHE_EVICT_EVERY = 100
+
+
+class _HttpCache:
+    """On-disk store of validators and bodies for conditional re-fetches.
+
+    Sites that send ETag or Last-Modified can answer a re-score with a 304
+    and no body; the cached HTML is then reused.
+    """
+
+    def __init__(self, path: str, max_entries: int = 2000):
+        self._max_entries = max_entries
+        self._puts = 0
+        self._lock = threading.Lock()
+        # Pre-create the file owner-only (and refuse a planted symlink) before
+        # sqlite opens it; the cache holds full page bodies.
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600))
+        os.chmod(path, 0o600)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT, "
+            "final_url TEXT, stored_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, final_url FROM http_cache WHERE url = ?", (url,),
+            ).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "body": row[2], "final_url": row[3]}
+
+    def put(self, url: str, response: requests.Response, body: str) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if not (etag or last_modified) or "no-store" in cache_control or "no-cache" in cache_control:
+            return
+        if len(body) > _HTTP_CACHE_MAX_BODY:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, response.url, time.time()),
+            )
+            # The sweep sorts the whole table, so it runs every N writes; the
+            # table may briefly hold up to N rows over the limit.
+            self._puts += 1
+            if self._puts % _HTTP_CACHE_EVICT_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM http_cache WHERE url NOT IN "
+                    "(SELECT url FROM http_cache ORDER BY stored_at DESC LIMIT ?)",
+                    (self._max_entries,),
+                )
+            self._conn.commit()
+
+
+def _http_cache_path() -> str:
+    from app.config import get_settings
+
+    configured = get_settings().http_cache_path
+    if configured:
+        return configured
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(base, "leadblitz")
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    return os.path.join(cache_dir, "http_cache.sqlite3")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_cache() -> Optional[_HttpCache]:
+    # Opened on first fetch rather than at import; if the file cannot be
+    # opened, fetches simply run without revalidation.
+    try:
+        return _HttpCache(_http_cache_path())
+    except (OSError, sqlite3.Error):
+        logger.warning("HTTP cache unavailable; fetching without revalidation", exc_info=True)
+        return None
+
+
+def _cache_get(url: str) -> Optional[Dict[str, str]]:
+    cache = _get_http_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(url)
+    except sqlite3.Error:
+        logger.warning("HTTP cache read failed for %s", url, exc_info=True)
+        return None
+
+
+def _cache_put(url: str, response: requests.Response, body: str) -> None:
+    cache = _get_http_cache()
+    if cache is None:
+        return
+    try:
+        cache.put(url, response, body)
+    except sqlite3.Error:
+        logger.warning("HTTP cache write failed for %s", url, exc_info=True)
+
+
+def _exhausted_retries(exc: requests.exceptions.RequestException) -> int:
+    # MaxRetryError carries no retry history; it is only raised once the
+    # session's whole budget has been spent.
+    if exc.args and isinstance(exc.args[0], MaxRetryError):
+        return _FETCH_RETRIES
+    return 0
+
+
+def fetch_site_safely(
+    url: str, timeout: int = 15, session: Optional[requests.Session] = None,
+) -> Dict[str, Any]:
+    http = session or _SESSION
 
     result = {"status": None, "html": "", "final_url": url, "errors": [], "retries": 0}
     parsed = urlparse(url)
     domain = f"{parsed.scheme}://{parsed.netloc}"
+    cached = _cache_get(url)
+    headers = {**_BASE_HEADERS, "User-Agent": random.choice(_USER_AGENTS), "Origin": domain}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = http.get(url, timeout=timeout, headers=headers, allow_redirects=True, verify=True)
+        result["status"] = response.status_code
+        result["final_url"] = response.url
+        retry_state = getattr(response.raw, "retries", None)
+        result["retries"] = len(retry_state.history) if retry_state else 0
+
+        if response.status_code == 304 and cached:
+            result["status"] = 200
+            result["html"] = cached["body"]
+            result["final_url"] = cached["final_url"] or response.url
+            return result
 
-    for attempt in range(max_retries):
-        headers = {
-            "User-Agent": random.choice(user_agents),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-GB,en-US;q=0.9,en;q=0.8",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "cross-site",
-            "Sec-Fetch-User": "?1",
-            "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"',
-            "Cache-Control": "no-cache",
-            "Referer": "https://www.google.com/",
-            "Origin": domain,
-        }
-
-        try:
-            response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True, verify=True)
-            result["status"] = response.status_code
-            result["final_url"] = response.url
-            result["retries"] = attempt
-
-            if response.status_code in [200, 202]:
-                if response.text and len(response.text) > 500:
-                    sample = response.text[:500]
-                    suspicious = sum(1 for c in sample if ord(c) < 32 and c not in "\n\r\t")
-                    if suspicious > 20:
-                        logger.debug("Garbled response for %s, retrying without compression", url)
-                        try:
-                            clean_headers = headers.copy()
-                            clean_headers.pop("Accept-Encoding", None)
-                            clean_resp = requests.get(url, timeout=timeout, headers=clean_headers, allow_redirects=True, verify=True)
-                            if clean_resp.status_code == 200 and clean_resp.text:
-                                result["html"] = clean_resp.text
-                                result["status"] = clean_resp.status_code
-                                result["final_url"] = clean_resp.url
-                                return result
-                        except Exception:
-                            pass
-                        if attempt < max_retries - 1:
-                            time.sleep(1.5)
-                            continue
-
-                if response.text and len(response.text) > 500:
-                    result["html"] = response.text
-                    result["errors"] = []
-                    return result
-                elif response.status_code == 202:
-                    result["errors"].append("HTTP 202 (needs browser rendering)")
-                    return result
-                else:
-                    result["html"] = response.text
-                    return result
-
-            elif response.status_code in [429, 503]:
-                result["errors"].append(f"HTTP {response.status_code}")
-                if attempt < max_retries - 1:
-                    time.sleep(2**attempt + random.uniform(0.5, 1.5))
-                    continue
-            elif response.status_code in [403, 401]:
-                result["errors"].append(f"HTTP {response.status_code} (blocked)")
-                return result
+        if response.status_code in [200, 202]:
+            # Gate on the raw body size; decoding .text re-runs charset
+            # detection on every access, so it is read once per branch.
+            body_size = len(response.content)
+            if body_size > 500:
+                sample = response.content[:500]
+                suspicious = len(sample) - len(sample.translate(None, _CONTROL_BYTES))
+                if suspicious > 20:
+                    logger.debug("Garbled response for %s, retrying without compression", url)
+                    try:
+                        clean_headers = headers.copy()
+                        clean_headers.pop("Accept-Encoding", None)
+                        clean_resp = http.get(url, timeout=timeout, headers=clean_headers, allow_redirects=True, verify=True)
+                        if clean_resp.status_code == 200 and clean_resp.content:
+                            result["html"] = clean_resp.text
+                            result["status"] = clean_resp.status_code
+                            result["final_url"] = clean_resp.url
+                            return result
+                    except Exception:
+                        pass
+
+            if body_size > 500:
+                result["html"] = response.text
+                if response.status_code == 200:
+                    _cache_put(url, response, result["html"])
+            elif response.status_code == 202:
+                result["errors"].append("HTTP 202 (needs browser rendering)")
             else:
-                result["errors"].append(f"HTTP {response.status_code}")
+                result["html"] = response.text
+        elif response.status_code in [403, 401]:
+            result["errors"].append(f"HTTP {response.status_code} (blocked)")
+        else:
+            result["errors"].append(f"HTTP {response.status_code}")
+
+    except requests.exceptions.Timeout as exc:
+        result["retries"] = _exhausted_retries(exc)
+        result["errors"].append("Timeout")
+    except requests.exceptions.SSLError:
+        try:
+            response = http.get(url, timeout=timeout, headers=headers, allow_redirects=True, verify=False)
+            if response.status_code == 200:
+                result["html"] = response.text
+                result["status"] = response.status_code
+                result["final_url"] = response.url
+                result["errors"] = ["SSL warning (insecure)"]
                 return result
-
-        except requests.exceptions.Timeout:
-            result["errors"].append(f"Timeout (attempt {attempt + 1})")
-            if attempt < max_retries - 1:
-                time.sleep(1 + attempt)
-                continue
-        except requests.exceptions.SSLError:
-            try:
-                response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True, verify=False)
-                if response.status_code == 200:
-                    result["html"] = response.text
-                    result["status"] = response.status_code
-                    result["final_url"] = response.url
-                    result["errors"] = ["SSL warning (insecure)"]
-                    return result
-            except Exception:
-                pass
-            result["errors"].append("SSL certificate error")
-            return result
-        except requests.exceptions.ConnectionError:
-            result["errors"].append(f"Connection failed (attempt {attempt + 1})")
-            if attempt < max_retries - 1:
-                time.sleep(1 + attempt)
-                continue
-        except requests.exceptions.TooManyRedirects:
-            result["errors"].append("Too many redirects")
-            return result
-        except Exception as exc:
-            result["errors"].append(f"Fetch error: {str(exc)[:100]}")
-            return result
-
-        result["retries"] = attempt + 1
+        except Exception:
+            pass
+        result["errors"].append("SSL certificate error")
+    except requests.exceptions.ConnectionError as exc:
+        result["retries"] = _exhausted_retries(exc)
+        # Once urllib3 runs out of read-timeout retries, requests reports a
+        # ConnectionError; a slow server is still a timeout, not unreachable.
+        cause = exc.args[0] if exc.args else None
+        if isinstance(cause, MaxRetryError):
+            cause = cause.reason
+        result["errors"].append("Timeout" if isinstance(cause, ReadTimeoutError) else "Connection failed")
+    except requests.exceptions.TooManyRedirects:
+        result["errors"].append("Too many redirects")
+    except Exception as exc:
+        result["errors"].append(f"Fetch error: {str(exc)[:100]}")
 
     return result
 
 
 def fetch_multiple_pages(base_url: str, max_pages: int = 4) -> Dict[str, Any]:
-    from bs4 import BeautifulSoup
+    # One session per site: the homepage and follow-up pages share a keep-alive
+    # connection, and cookies never leak between different leads' sites.
+    with _new_session() as session:
+        return _fetch_pages(base_url, max_pages, session)
+
+
+def _fetch_pages(base_url: str, max_pages: int, session: requests.Session) -> Dict[str, Any]:
+    from bs4 import BeautifulSoup, SoupStrainer
 
     fetched_pages = {}
     combined_html = ""
     all_errors = []
     priority_links_found = []
 
-    homepage_result = fetch_site_safely(base_url)
+    homepage_result = fetch_site_safely(base_url, session=session)
     fetched_pages["homepage"] = homepage_result
 
     if homepage_result["html"]:
         combined_html += f"\n\n<!-- Page: homepage -->\n{homepage_result['html']}"
-        soup = BeautifulSoup(homepage_result["html"], "html.parser")
-        priority_links_found = _extract_priority_links_from_soup(soup, homepage_result.get("final_url", base_url))
+        # Link discovery only needs anchors; the scorers parse the full page later.
+        anchor_soup = BeautifulSoup(homepage_result["html"], "lxml", parse_only=SoupStrainer("a", href=True))
+        priority_links_found = _extract_priority_links_from_soup(anchor_soup, homepage_result.get("final_url", base_url))
 
     if homepage_result["errors"]:
         all_errors.extend([f"homepage: {err}" for err in homepage_result["errors"]])
@@ -189,14 +352,24 @@ def fetch_multiple_pages(base_url: str, max_pages: int = 4) -> Dict[str, Any]:
             if url.rstrip("/") not in fetched_urls and len(pages_to_fetch) < max_pages - 1:
                 pages_to_fetch.append((name, url))
 
+    targets = []
     for page_name, url in pages_to_fetch[: max_pages - 1]:
         if url.rstrip("/") in fetched_urls:
             continue
-        result = fetch_site_safely(url)
+        fetched_urls.add(url.rstrip("/"))
+        targets.append((page_name, url))
+
+    # Follow-up pages are independent, so fetch them concurrently and merge
+    # the results back in priority order.
+    results = []
+    if targets:
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            results = list(executor.map(lambda t: fetch_site_safely(t[1], session=session), targets))
+
+    for (page_name, url), result in zip(targets, results):
         if result["status"] == 404:
             continue
         fetched_pages[page_name] = result
-        fetched_urls.add(url.rstrip("/"))
         if result["html"]:
             combined_html += f"\n\n<!-- Page: {page_name} -->\n{result['html']}"
         if result["errors"]:
@@ -213,23 +386,14 @@ def fetch_multiple_pages(base_url: str, max_pages: int = 4) -> Dict[str, Any]:
 
 
 def _extract_priority_links_from_soup(soup, base_url: str) -> List[str]:
+    from app.services.html_analysis import scan_anchors
+
     priority_keywords = [
         "contact", "quote", "book", "enquir", "pricing",
         "get-in-touch", "reach-us", "schedule", "about", "services",
     ]
     priority_links = []
-    base_domain = urlparse(base_url).netloc.replace("www.", "")
-
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
-        text = link.get_text(strip=True).lower()
-        if href.startswith("#") or href.startswith("javascript:") or href.startswith("mailto:") or href.startswith("tel:"):
-            continue
-        full_url = urljoin(base_url, href)
-        link_domain = urlparse(full_url).netloc.replace("www.", "")
-        if link_domain != base_domain:
-            continue
-        href_lower = href.lower()
+    for full_url, href_lower, text in scan_anchors(soup, base_url)["internal_links"]:
         if any(kw in href_lower or kw in text for kw in priority_keywords):
             if full_url not in priority_links:
                 priority_links.append(full_url)
@@ -237,35 +401,44 @@ def _extract_priority_links_from_soup(soup, base_url: str) -> List[str]:
     return priority_links[:8]
 
 
-def extract_site_content_for_ai(html: str, max_chars: int = 6000) -> Dict[str, Any]:
+def extract_site_content_for_ai(html: str, max_chars: int = 6000, soup=None) -> Dict[str, Any]:
+    """Summarise a page for the AI prompt.
+
+    Pass ``soup`` to reuse an existing parse of ``html``; it is only read,
+    never modified, so it can be shared with the other detectors.
+    """
     from bs4 import BeautifulSoup
     import re
 
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
+    from app.services.html_analysis import find_visible, visible_strings, visible_text
+
+    if soup is None:
+        soup = BeautifulSoup(html, "lxml")
 
+    # The soup may be shared, so script/style/noscript are skipped rather than
+    # decomposed; noscript fallbacks ("Please enable JavaScript", duplicate
+    # lazy-load images) would otherwise leak into every field below.
     title = soup.find("title")
     title_text = title.get_text(strip=True) if title else ""
 
-    h1_texts = [h.get_text(strip=True) for h in soup.find_all("h1", limit=3) if h.get_text(strip=True)]
-    h2_texts = [h.get_text(strip=True) for h in soup.find_all("h2", limit=5) if h.get_text(strip=True)]
+    h1_texts = [t for h in find_visible(soup, "h1", limit=3) if (t := visible_text(h))]
+    h2_texts = [t for h in find_visible(soup, "h2", limit=5) if (t := visible_text(h))]
 
-    buttons = soup.find_all("button", limit=10)
-    cta_links = soup.find_all("a", class_=re.compile(r"btn|button|cta", re.I), limit=10)
-    cta_texts = [e.get_text(strip=True) for e in buttons + cta_links if e.get_text(strip=True) and len(e.get_text(strip=True)) < 50]
+    buttons = find_visible(soup, "button", limit=10)
+    cta_links = find_visible(soup, "a", limit=10, class_=re.compile(r"btn|button|cta", re.I))
+    cta_texts = [t for e in buttons + cta_links if (t := visible_text(e)) and len(t) < 50]
 
-    nav = soup.find("nav") or soup.find("header")
+    navs = find_visible(soup, "nav", limit=1) or find_visible(soup, "header", limit=1)
     nav_links = []
-    if nav and hasattr(nav, "find_all"):
-        nav_links = [a.get_text(strip=True) for a in nav.find_all("a", limit=15) if a.get_text(strip=True)]
+    if navs:
+        nav_links = [t for a in find_visible(navs[0], "a", limit=15) if (t := visible_text(a))]
 
-    image_alts = [img.get("alt", "") for img in soup.find_all("img", limit=10) if img.get("alt")]
+    image_alts = [img.get("alt", "") for img in find_visible(soup, "img", limit=10) if img.get("alt")]
 
-    text_content = soup.get_text(separator=" ", strip=True)
+    text_content = " ".join(visible_strings(soup))
     text_excerpt = text_content[:max_chars]
 
-    link_texts = [a.get_text(strip=True) for a in soup.find_all("a", limit=30) if a.get_text(strip=True)]
+    link_texts = [t for a in find_visible(soup, "a", limit=30) if (t := visible_text(a))]
 
     return {
         "title": title_text,
@@ -2,21 +2,59 @@
 
 import re
 import json
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from bs4 import BeautifulSoup
 
+from app.services.html_analysis import scan_anchors
+
+_OBFUSCATED_EMAIL_PATTERNS = [
+    re.compile(p, re.I) for p in (
+        r'([a-zA-Z0-9._%+-]+)\s*\[\s*at\s*\]\s*([a-zA-Z0-9.-]+)\s*\[\s*dot\s*\]\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*\(\s*at\s*\)\s*([a-zA-Z0-9.-]+)\s*\(\s*dot\s*\)\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+)\.([a-zA-Z]{2,})',
+    )
+]
+_PRIVACY_HREF_RE = re.compile(r"privacy|cookie|gdpr", re.I)
+_PRIVACY_TEXT_RE = re.compile(r"privacy policy|cookie policy", re.I)
+_TEL_HREF_RE = re.compile(r"^tel:")
+_MAILTO_HREF_RE = re.compile(r"^mailto:")
+_PHONE_PATTERN = r"\+?\d{1,4}[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}"
+_PHONE_RE = re.compile(_PHONE_PATTERN)
+_CONTACT_RE = re.compile(
+    r"(?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    rf"|(?P<phone>{_PHONE_PATTERN})"
+)
+_ADDRESS_RE = re.compile(r"address|location", re.I)
+_MAP_CLASS_RE = re.compile(r"map", re.I)
+_WORD_RE = re.compile(r"\b\w+\b")
+_FORM_CAT_RE = re.compile(
+    r"(?P<contact_form>contact|enquir|inquiry|message|get in touch)"
+    r"|(?P<quote_form>quote|estimate|pricing)"
+    r"|(?P<booking_form>book|appointment|schedule|reservation)"
+    r"|(?P<newsletter_form>subscribe|newsletter|signup|sign up)"
+)
+_FORM_CAT_PRIORITY = ("contact_form", "quote_form", "booking_form", "newsletter_form")
+_FORM_ATTRS = ("class", "id", "name", "action", "placeholder", "value")
+_CTA_TEXT_RE = re.compile(
+    r"contact|call|get quote|free quote|request|enquire|inquire|book now|schedule|get started|"
+    r"learn more|find out|speak to|talk to|reach out|connect|start now|try free|demo|consultation",
+    re.I,
+)
+_CTA_ATTR_SELECTOR = ", ".join(
+    [f'{tag}[class*="{cls}" i]' for tag in ("a", "button")
+     for cls in ("cta", "btn-primary", "action-btn", "contact-btn")]
+    + [f'{tag}[href*="{kw}" i]' for tag in ("a", "button")
+       for kw in ("contact", "quote", "book", "schedule", "enquir")]
+)
+_SOCIAL_PROOF_RE = re.compile(r"testimonial|review|client|case study|award|certified", re.I)
+
 
 def decode_obfuscated_email(text: str) -> List[str]:
     emails = []
-    patterns = [
-        (r'([a-zA-Z0-9._%+-]+)\s*\[\s*at\s*\]\s*([a-zA-Z0-9.-]+)\s*\[\s*dot\s*\]\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*\(\s*at\s*\)\s*([a-zA-Z0-9.-]+)\s*\(\s*dot\s*\)\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+)\.([a-zA-Z]{2,})', r'\1@\2.\3'),
-    ]
-    for pattern, _ in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for pattern in _OBFUSCATED_EMAIL_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             if isinstance(match, tuple):
                 emails.append(f"{match[0]}@{match[1]}.{match[2]}".lower())
@@ -64,19 +102,28 @@ def _extract_from_schema(data: dict, contact_info: Dict[str, list]):
             contact_info["addresses"].append(", ".join(p for p in parts if p))
 
 
+def _form_attr_blob(form) -> str:
+    parts: List[str] = []
+    for tag in (form, *form.find_all(True)):
+        for attr in _FORM_ATTRS:
+            value = tag.get(attr)
+            if not value:
+                continue
+            if isinstance(value, str):
+                parts.append(value)
+            else:
+                parts.extend(value)
+    return " ".join(parts)
+
+
 def detect_contact_forms(soup: BeautifulSoup) -> Tuple[bool, List[str]]:
     form_types: List[str] = []
     for form in soup.find_all("form"):
-        form_html = str(form).lower()
-        form_text = form.get_text(separator=" ", strip=True).lower()
-        if any(kw in form_html or kw in form_text for kw in ["contact", "enquir", "inquiry", "message", "get in touch"]):
-            form_types.append("contact_form")
-        elif any(kw in form_html or kw in form_text for kw in ["quote", "estimate", "pricing"]):
-            form_types.append("quote_form")
-        elif any(kw in form_html or kw in form_text for kw in ["book", "appointment", "schedule", "reservation"]):
-            form_types.append("booking_form")
-        elif any(kw in form_html or kw in form_text for kw in ["subscribe", "newsletter", "signup", "sign up"]):
-            form_types.append("newsletter_form")
+        blob = (_form_attr_blob(form) + "\n" + form.get_text(separator=" ", strip=True)).lower()
+        hits = {m.lastgroup for m in _FORM_CAT_RE.finditer(blob)}
+        category = next((c for c in _FORM_CAT_PRIORITY if c in hits), None)
+        if category:
+            form_types.append(category)
         email_inputs = form.find_all("input", attrs={"type": "email"})
         text_areas = form.find_all("textarea")
         if (email_inputs or text_areas) and "contact_form" not in form_types:
@@ -85,52 +132,44 @@ def detect_contact_forms(soup: BeautifulSoup) -> Tuple[bool, List[str]]:
 
 
 def detect_cta_elements(soup: BeautifulSoup) -> Tuple[int, List[str]]:
-    cta_keywords = [
-        "contact", "call", "get quote", "free quote", "request", "enquire", "inquire",
-        "book now", "schedule", "get started", "learn more", "find out", "speak to",
-        "talk to", "reach out", "connect", "start now", "try free", "demo", "consultation",
-    ]
+    # Class/href CTAs come straight from the selector; text-only CTAs are found
+    # from matching text nodes, so plain navigation links are never visited.
+    candidates = soup.select(_CTA_ATTR_SELECTOR)
+    for string in soup.find_all(string=_CTA_TEXT_RE):
+        element = string.find_parent(["a", "button"])
+        if element is not None:
+            candidates.append(element)
+
+    seen = set()
     cta_texts: List[str] = []
-    for button in soup.find_all(["button", "a"]):
-        text = button.get_text(strip=True).lower()
-        classes = " ".join(button.get("class", [])).lower()
-        href = (button.get("href") or "").lower()
-        is_cta = (
-            any(kw in text for kw in cta_keywords)
-            or any(cls in classes for cls in ["cta", "btn-primary", "btn-cta", "action-btn", "contact-btn"])
-            or any(kw in href for kw in ["contact", "quote", "book", "schedule", "enquir"])
-        )
-        if is_cta and text and len(text) < 50:
+    for element in candidates:
+        if id(element) in seen:
+            continue
+        seen.add(id(element))
+        text = element.get_text(strip=True).lower()
+        if text and len(text) < 50:
             cta_texts.append(text[:40])
     return len(cta_texts), cta_texts[:10]
 
 
-def extract_priority_links(soup: BeautifulSoup, base_url: str) -> List[str]:
-    from urllib.parse import urljoin, urlparse
-
+def extract_priority_links(
+    soup: BeautifulSoup, base_url: str, anchors: Optional[Dict[str, Any]] = None,
+) -> List[str]:
     priority_keywords = [
         "contact", "about", "services", "quote", "book", "enquir",
         "pricing", "get-in-touch", "reach-us", "support", "help",
     ]
+    if anchors is None:
+        anchors = scan_anchors(soup, base_url)
     priority_links: List[str] = []
-    base_domain = urlparse(base_url).netloc.replace("www.", "")
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
-        text = link.get_text(strip=True).lower()
-        if href.startswith("#") or href.startswith("javascript:") or href.startswith("mailto:") or href.startswith("tel:"):
-            continue
-        full_url = urljoin(base_url, href)
-        link_domain = urlparse(full_url).netloc.replace("www.", "")
-        if link_domain != base_domain:
-            continue
-        href_lower = href.lower()
+    for full_url, href_lower, text in anchors["internal_links"]:
         if any(kw in href_lower or kw in text for kw in priority_keywords):
             if full_url not in priority_links:
                 priority_links.append(full_url)
     return priority_links[:5]
 
 
-def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
+def score_site_heuristics(html: str, final_url: str = "", soup: Optional[BeautifulSoup] = None) -> Dict[str, Any]:
     if not html or len(html.strip()) < 100:
         return {
             "scores": {"mobile": 0, "security": 0, "seo": 0, "contact": 0, "content": 0, "tech": 0},
@@ -139,10 +178,13 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
             "rendering_limitations": True,
         }
 
-    soup = BeautifulSoup(html, "html.parser")
+    if soup is None:
+        soup = BeautifulSoup(html, "lxml")
     evidence: Dict[str, Any] = {}
     scores = {"mobile": 0, "security": 0, "seo": 0, "contact": 0, "content": 0, "tech": 0}
     rendering_limited = len(html) < 1000
+    text_content = soup.get_text(separator=" ", strip=True)
+    anchors = scan_anchors(soup, final_url)
 
     # 1. Mobile (10 pts)
     viewport = soup.find("meta", attrs={"name": "viewport"})
@@ -150,7 +192,7 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
         scores["mobile"] += 6
         evidence["viewport"] = str(viewport)[:100]
     buttons = soup.find_all("button")
-    large_links = [a for a in soup.find_all("a") if a.get_text(strip=True)]
+    large_links = anchors["link_texts"]
     if len(buttons) > 0 or len(large_links) > 5:
         scores["mobile"] += 4
 
@@ -158,15 +200,14 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     if final_url.startswith("https://"):
         scores["security"] += 6
         evidence["https"] = True
-    privacy_links = soup.find_all("a", href=re.compile(r"privacy|cookie|gdpr", re.I))
-    privacy_text = soup.find_all(string=re.compile(r"privacy policy|cookie policy", re.I))
+    privacy_links = soup.find_all("a", href=_PRIVACY_HREF_RE)
+    privacy_text = soup.find(string=_PRIVACY_TEXT_RE)
     if privacy_links or privacy_text:
         scores["security"] += 4
 
     # 3. SEO (8 pts)
     title_tag = soup.find("title")
-    if title_tag and title_tag.get_text(strip=True):
-        title_text = title_tag.get_text(strip=True)
+    if title_tag and (title_text := title_tag.get_text(strip=True)):
         if 10 <= len(title_text) <= 65:
             scores["seo"] += 4
         evidence["title"] = title_text[:100]
@@ -178,42 +219,48 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
 
     # 4. Contact (8 pts)
     contact_items: List[str] = []
-    emails_found: List[str] = []
-    phones_found: List[str] = []
-
-    tel_links = soup.find_all("a", href=re.compile(r"^tel:"))
-    phone_patterns = soup.find_all(string=re.compile(r"\+?\d{1,4}[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}"))
-    if tel_links or phone_patterns:
+    emails_found: Set[str] = set()
+    phones_found: Set[str] = set()
+
+    text_phones = False
+    for m in _CONTACT_RE.finditer(text_content):
+        if m.group("email"):
+            emails_found.add(m.group("email").lower().strip())
+        else:
+            text_phones = True
+
+    tel_links = soup.find_all("a", href=_TEL_HREF_RE)
+    # get_text() skips <script> strings, so numbers that only appear in
+    # JSON-LD or inline config still need the per-string search.
+    if tel_links or text_phones or soup.find(string=_PHONE_RE):
         scores["contact"] += 2
-        phones_found.extend([str(t.get("href", ""))[:50] for t in tel_links[:2]])
+        phones_found.update(str(t.get("href", ""))[:50] for t in tel_links[:2])
 
-    mailto_links = soup.find_all("a", href=re.compile(r"^mailto:"))
+    mailto_links = soup.find_all("a", href=_MAILTO_HREF_RE)
     for m in mailto_links:
         href = m.get("href", "").replace("mailto:", "").split("?")[0]
         if "@" in href:
-            emails_found.append(href)
+            emails_found.add(href.lower().strip())
 
-    text_content = soup.get_text(separator=" ", strip=True)
-    emails_found.extend(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text_content))
-    emails_found.extend(decode_obfuscated_email(text_content))
+    emails_found.update(decode_obfuscated_email(text_content))
 
     schema_contact = extract_schema_org_contact(soup)
-    emails_found.extend(schema_contact.get("emails", []))
-    phones_found.extend(schema_contact.get("phones", []))
+    emails_found.update(e.lower().strip() for e in schema_contact.get("emails", []) if isinstance(e, str) and "@" in e)
+    phones_found.update(p.strip() for p in schema_contact.get("phones", []) if isinstance(p, str) and p.strip())
 
-    emails_found = list(set(e.lower().strip() for e in emails_found if e and "@" in e))
     if emails_found:
         scores["contact"] += 3
-        contact_items.extend([f"email: {e}" for e in emails_found[:3]])
-        evidence["emails_found"] = emails_found[:5]
+        email_list = list(emails_found)
+        contact_items.extend([f"email: {e}" for e in email_list[:3]])
+        evidence["emails_found"] = email_list[:5]
 
     has_contact_form, form_types = detect_contact_forms(soup)
     if has_contact_form:
         scores["contact"] += 2
         evidence["contact_forms"] = form_types
 
-    address_keywords = soup.find_all(string=re.compile(r"address|location", re.I))
-    map_embeds = soup.find_all(["iframe", "div"], attrs={"class": re.compile(r"map", re.I)})
+    address_keywords = soup.find(string=_ADDRESS_RE)
+    map_embeds = soup.find_all(["iframe", "div"], attrs={"class": _MAP_CLASS_RE})
     schema_addresses = schema_contact.get("addresses", [])
     if address_keywords or map_embeds or schema_addresses:
         scores["contact"] += 1
@@ -231,17 +278,16 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
         "ctas": cta_count,
     }
 
-    priority_links = extract_priority_links(soup, final_url)
+    priority_links = extract_priority_links(soup, final_url, anchors)
     if priority_links:
         evidence["priority_links"] = priority_links
 
     # 5. Content (8 pts)
     h1_tags = soup.find_all("h1")
-    if h1_tags and h1_tags[0].get_text(strip=True):
+    if h1_tags and (h1_text := h1_tags[0].get_text(strip=True)):
         scores["content"] += 4
-        evidence["h1"] = h1_tags[0].get_text(strip=True)[:150]
-    text_content = soup.get_text(separator=" ", strip=True)
-    words = re.findall(r"\b\w+\b", text_content)
+        evidence["h1"] = h1_text[:150]
+    words = _WORD_RE.findall(text_content)
     word_count = len(words)
     evidence["text_word_count"] = word_count
     if word_count >= 200:
@@ -254,8 +300,7 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     if modern_images:
         scores["tech"] += 3
 
-    social_proof_keywords = ["testimonial", "review", "client", "case study", "award", "certified"]
-    if any(soup.find_all(string=re.compile(kw, re.I)) for kw in social_proof_keywords):
+    if soup.find(string=_SOCIAL_PROOF_RE):
         scores["tech"] += 3
 
     return {
@@ -1,4 +1,5 @@
 import logging
+import re
 from typing import Dict, Optional
 
 from twilio.rest import Client
@@ -7,6 +8,8 @@ from app.services.encryption import decrypt
 
 logger = logging.getLogger(__name__)
 
+_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
 
 def validate_sms_config(account_sid: Optional[str] = None, auth_token: Optional[str] = None, phone_number: Optional[str] = None) -> bool:
     return all([account_sid, auth_token, phone_number])
@@ -27,10 +30,7 @@ def prepare_sms_variables(lead: Dict) -> Dict[str, str]:
 
 
 def render_sms_template(template: str, variables: Dict[str, str]) -> str:
-    message = template
-    for key, value in variables.items():
-        message = message.replace(f"{{{{{key}}}}}", value)
-    return message
+    return _VAR_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), template)
 
 
 def send_sms(
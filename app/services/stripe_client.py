@@ -1,3 +1,4 @@
+import functools
 import json
 import logging
 from typing import Any, Dict, Optional
@@ -44,6 +45,7 @@ CREDIT_COSTS = {
 }
 
 
+@functools.lru_cache(maxsize=1)
 def _get_stripe():
     s = get_settings()
     stripe.api_key = s.stripe_secret_key
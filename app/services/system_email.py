@@ -1,56 +1,186 @@
+import asyncio
 import smtplib
 import logging
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from typing import Any, Dict, List, Tuple
+
+import aiosmtplib
+from markupsafe import escape
 
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+class _SmtpPool:
+    """Authenticated SMTP connections kept open between sends.
+
+    Connections are keyed by (host, port, user), health-checked with NOOP
+    when taken from the pool, and recycled after a fixed number of messages
+    so long-lived sessions don't run into server-side limits.
+    """
+
+    def __init__(self, max_idle: int = 4, max_messages_per_connection: int = 100):
+        self._max_idle = max_idle
+        self._max_messages = max_messages_per_connection
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, int, str], List[Dict[str, Any]]] = {}
+
+    def acquire(self, s) -> Dict[str, Any]:
+        key = (s.smtp_host, s.smtp_port, s.smtp_user)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                break
+            try:
+                if conn["server"].noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.discard(conn)
+
+        server = smtplib.SMTP(s.smtp_host, s.smtp_port, timeout=15)
+        try:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(s.smtp_user, s.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return {"key": key, "server": server, "sent": 0}
+
+    def release(self, conn: Dict[str, Any]) -> None:
+        if conn["sent"] < self._max_messages:
+            with self._lock:
+                idle = self._idle.setdefault(conn["key"], [])
+                if len(idle) < self._max_idle:
+                    idle.append(conn)
+                    return
+        self.discard(conn)
+
+    def discard(self, conn: Dict[str, Any]) -> None:
+        try:
+            conn["server"].quit()
+        except (smtplib.SMTPException, OSError):
+            conn["server"].close()
+
+
+_SMTP_POOL = _SmtpPool()
+
+
+def _is_configured(s) -> bool:
+    return bool(s.smtp_user and s.smtp_password and s.smtp_host)
+
+
 def is_smtp_configured() -> bool:
+    return _is_configured(get_settings())
+
+
+def _build_message(from_email: str, to_email: str, subject: str, html_body: str) -> str:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = from_email
+    msg["To"] = to_email
+    msg.attach(MIMEText(html_body, "html"))
+    return msg.as_string()
+
+
+def send_system_email_batch(messages: List[Tuple[str, str, str]]) -> List[bool]:
+    """Send ``(to_email, subject, html_body)`` messages over pooled SMTP connections.
+
+    Returns one success flag per message, in order.
+    """
     s = get_settings()
-    return bool(s.smtp_user and s.smtp_password and s.smtp_host)
+    if not _is_configured(s):
+        logger.warning("[SYSTEM EMAIL] SMTP not configured — set SMTP_HOST/USER/PASSWORD env vars")
+        return [False] * len(messages)
+
+    from_email = s.smtp_from_email or f"noreply@{s.smtp_host}"
+    results: List[bool] = []
+    conn = None
+    try:
+        for to_email, subject, html_body in messages:
+            try:
+                payload = _build_message(from_email, to_email, subject, html_body)
+                if conn is None:
+                    conn = _SMTP_POOL.acquire(s)
+                conn["server"].sendmail(from_email, to_email, payload)
+                conn["sent"] += 1
+                logger.info(f"[SYSTEM EMAIL] Sent '{subject}' to {to_email}")
+                results.append(True)
+            except Exception as e:
+                logger.error(f"[SYSTEM EMAIL] Failed to send to {to_email}: {e}")
+                results.append(False)
+                # The connection may be half-way through a transaction or
+                # dropped; start the next message on a fresh one.
+                if conn is not None:
+                    _SMTP_POOL.discard(conn)
+                    conn = None
+    finally:
+        if conn is not None:
+            _SMTP_POOL.release(conn)
+    return results
 
 
 def send_system_email(to_email: str, subject: str, html_body: str) -> bool:
+    return send_system_email_batch([(to_email, subject, html_body)])[0]
+
+
+async def send_system_email_batch_async(messages: List[Tuple[str, str, str]], concurrency: int = 4) -> List[bool]:
+    """Async counterpart of ``send_system_email_batch`` for use inside the event loop.
+
+    Up to ``concurrency`` SMTP connections drain a shared queue, so network
+    round-trips for different recipients overlap instead of running back to
+    back.
+    """
     s = get_settings()
-    if not is_smtp_configured():
+    if not _is_configured(s):
         logger.warning("[SYSTEM EMAIL] SMTP not configured — set SMTP_HOST/USER/PASSWORD env vars")
-        return False
+        return [False] * len(messages)
 
     from_email = s.smtp_from_email or f"noreply@{s.smtp_host}"
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        msg.attach(MIMEText(html_body, "html"))
+    results = [False] * len(messages)
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, message in enumerate(messages):
+        queue.put_nowait((index, *message))
 
-        with smtplib.SMTP(s.smtp_host, s.smtp_port, timeout=15) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            server.login(s.smtp_user, s.smtp_password)
-            server.sendmail(from_email, to_email, msg.as_string())
+    async def worker() -> None:
+        client = None
+        while not queue.empty():
+            index, to_email, subject, html_body = queue.get_nowait()
+            try:
+                if client is None:
+                    client = aiosmtplib.SMTP(hostname=s.smtp_host, port=s.smtp_port, start_tls=True, timeout=15)
+                    await client.connect()
+                    await client.login(s.smtp_user, s.smtp_password)
+                await client.sendmail(from_email, [to_email], _build_message(from_email, to_email, subject, html_body))
+                logger.info(f"[SYSTEM EMAIL] Sent '{subject}' to {to_email}")
+                results[index] = True
+            except Exception as e:
+                logger.error(f"[SYSTEM EMAIL] Failed to send to {to_email}: {e}")
+                if client is not None:
+                    client.close()
+                    client = None
+        if client is not None:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
 
-        logger.info(f"[SYSTEM EMAIL] Sent '{subject}' to {to_email}")
-        return True
-    except Exception as e:
-        logger.error(f"[SYSTEM EMAIL] Failed to send to {to_email}: {e}")
-        return False
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(messages)))))
+    return results
 
 
-def build_branded_email(
-    heading: str,
-    body_content: str,
-    button_text: str = None,
-    button_url: str = None,
-    footer_note: str = None,
-) -> str:
-    button_html = ""
-    if button_text and button_url:
-        button_html = f"""
+async def send_system_email_async(to_email: str, subject: str, html_body: str) -> bool:
+    return (await send_system_email_batch_async([(to_email, subject, html_body)]))[0]
+
+
+_BUTTON_TMPL = """
             <div style="text-align: center; margin: 32px 0;">
                 <a href="{button_url}"
                    style="display: inline-block; background: #111; color: #fff;
@@ -64,11 +194,9 @@ def build_branded_email(
             </p>
         """
 
-    footer_html = ""
-    if footer_note:
-        footer_html = f'<p style="color: #6b7280; font-size: 14px; margin-top: 24px;">{footer_note}</p>'
+_FOOTER_TMPL = '<p style="color: #6b7280; font-size: 14px; margin-top: 24px;">{footer_note}</p>'
 
-    return f"""<!DOCTYPE html>
+_SKELETON = """<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1.0"></head>
 <body style="margin: 0; padding: 0; background-color: #fafafa; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
@@ -90,3 +218,30 @@ def build_branded_email(
     </div>
 </body>
 </html>"""
+
+
+def build_branded_email(
+    heading: str,
+    body_content: str,
+    button_text: str = None,
+    button_url: str = None,
+    footer_note: str = None,
+) -> str:
+    # body_content is trusted HTML from our own templates; everything else is
+    # plain text and gets escaped before it lands in markup or attributes, so
+    # quotes come out as entities (didn't -> didn&#39;t) and any tags passed
+    # in heading or footer_note are shown literally.
+    button_html = ""
+    if button_text and button_url:
+        button_html = _BUTTON_TMPL.format_map({"button_text": escape(button_text), "button_url": escape(button_url)})
+
+    footer_html = ""
+    if footer_note:
+        footer_html = _FOOTER_TMPL.format_map({"footer_note": escape(footer_note)})
+
+    return _SKELETON.format_map({
+        "heading": escape(heading),
+        "body_content": body_content,
+        "button_html": button_html,
+        "footer_html": footer_html,
+    })
@@ -1,34 +1,243 @@
 """Tech stack detection from HTML — near copy from original."""
 
+import copy
+import hashlib
+import os
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import ahocorasick
 from bs4 import BeautifulSoup
-
-
-def detect_technographics(html: str, final_url: str = "", response_headers: Optional[Dict] = None) -> Dict[str, Any]:
+from lxml import etree
+
+from app.services.html_analysis import ascii_lower
+
+# Matched against lowercased HTML, so the patterns are lowercase and need no re.I.
+# Each one starts with "jquery" and is only tried at offsets where that token
+# occurs, within a _JQUERY_WINDOW-character span.
+_JQUERY_RES = [
+    re.compile(p) for p in (
+        r"jquery[.-](\d+\.\d+(?:\.\d+)?)",
+        r"jquery\.min\.js\?ver=(\d+\.\d+(?:\.\d+)?)",
+        r"jquery\s+v?(\d+\.\d+(?:\.\d+)?)",
+    )
+]
+_JQUERY_WINDOW = 200
+_FAVICON_REL_RE = re.compile(r"icon|shortcut", re.I)
+_EXTERNAL_PREFIXES = ("http", "//")
+
+# In priority order: the first indicator present decides the CMS.
+_CMS_INDICATORS = [
+    ("wp-content", "WordPress", "high"),
+    ("wp-includes", "WordPress", "high"),
+    ("wix.com", "Wix", "high"),
+    ("wixsite.com", "Wix", "high"),
+    ("_wix_browser_sess", "Wix", "high"),
+    ("squarespace.com", "Squarespace", "high"),
+    ("squarespace-cdn.com", "Squarespace", "high"),
+    ("cdn.shopify.com", "Shopify", "high"),
+    ("shopify", "Shopify", "high"),
+    ("webflow.com", "Webflow", "medium"),
+    ("/media/jui/", "Joomla", "medium"),
+    ("joomla", "Joomla", "medium"),
+    ("drupal", "Drupal", "medium"),
+    ("/sites/default/files", "Drupal", "medium"),
+    ("/misc/drupal.js", "Drupal", "medium"),
+    ("ghost.io", "Ghost", "medium"),
+    ("ghost-", "Ghost", "medium"),
+    ("weebly.com", "Weebly", "high"),
+    ("godaddy", "GoDaddy", "medium"),
+]
+_GA_INDICATORS = ["gtag(", "googletagmanager.com", "google-analytics.com", "ga("]
+_META_PIXEL_INDICATORS = ["connect.facebook.net", "fbq(", "facebook.com/tr"]
+_OTHER_ANALYTICS = [
+    ("hotjar.com", "Hotjar"), ("clarity.ms", "Microsoft Clarity"), ("plausible.io", "Plausible"),
+    ("matomo", "Matomo"), ("mixpanel.com", "Mixpanel"), ("segment.com", "Segment"),
+]
+# (platform, any of these in the href, none of these in the href)
+_SOCIAL_RULES = [
+    ("facebook", ("facebook.com",), ("/tr", "sharer")),
+    ("instagram", ("instagram.com",), ()),
+    ("linkedin", ("linkedin.com",), ("share",)),
+    ("twitter", ("twitter.com", "x.com/"), ()),
+    ("youtube", ("youtube.com",), ()),
+    ("tiktok", ("tiktok.com",), ()),
+]
+_COOKIE_CONSENT_INDICATORS = [
+    "cookie-consent", "cookieconsent", "cookie-notice", "cookie-banner",
+    "cookie-popup", "gdpr-consent", "cc-banner", "cc-window",
+    "cookiebot", "osano", "onetrust", "termly", "iubenda",
+]
+
+
+def _build_indicator_automaton() -> ahocorasick.Automaton:
+    tokens = {"jquery", "favicon"}
+    tokens.update(_GA_INDICATORS, _META_PIXEL_INDICATORS, _COOKIE_CONSENT_INDICATORS)
+    tokens.update(i for i, _, _ in _CMS_INDICATORS)
+    tokens.update(i for i, _ in _OTHER_ANALYTICS)
+    automaton = ahocorasick.Automaton()
+    for token in tokens:
+        automaton.add_word(token, token)
+    automaton.make_automaton()
+    return automaton
+
+
+# One Aho-Corasick pass over html_lower finds every fixed indicator the
+# substring-based detectors look for.
+_INDICATORS = _build_indicator_automaton()
+
+
+def _scan_indicators(html_lower: str) -> Set[str]:
+    return {token for _, token in _INDICATORS.iter(html_lower)}
+
+
+_RESULT_CACHE_SIZE = 4096
+_result_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def detect_technographics(
+    html: str,
+    final_url: str = "",
+    response_headers: Optional[Dict] = None,
+    soup: Optional[BeautifulSoup] = None,
+    html_lower: Optional[str] = None,
+) -> Dict[str, Any]:
     if not html or len(html.strip()) < 50:
         return _empty()
 
-    soup = BeautifulSoup(html, "html.parser")
-    html_lower = html.lower()
+    # Re-scores, retries and mirror pages often hand us identical HTML; the
+    # result depends only on the markup and the final URL.
+    key = (hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=16).digest(), final_url)
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is not None:
+            _result_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+
+    result = _detect(html, final_url, soup, html_lower)
+    with _result_cache_lock:
+        _result_cache[key] = result
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return copy.deepcopy(result)
+
+
+def _detect_page(page: tuple) -> Dict[str, Any]:
+    return detect_technographics(*page)
+
+
+def detect_technographics_batch(pages: List[tuple], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Run detection for ``(html, final_url[, response_headers])`` tuples in worker processes.
+
+    Parsing and scanning are CPU-bound Python, so threads would serialise on
+    the GIL. The regexes and indicator automaton are built at import, so
+    forked workers inherit them. Results keep the order of *pages*.
+    """
+    if not pages:
+        return []
+    if len(pages) == 1:
+        return [_detect_page(pages[0])]
+    max_workers = min(workers or os.cpu_count() or 1, len(pages))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_detect_page, pages, chunksize=8))
+
+
+def _detect(
+    html: str, final_url: str, soup: Optional[BeautifulSoup], html_lower: Optional[str],
+) -> Dict[str, Any]:
+    if html_lower is None:
+        html_lower = ascii_lower(html)
+    # Tiny documents without a <body> are error pages or parked placeholders;
+    # only the scheme says anything about them.
+    if len(html) < 2048 and "<body" not in html_lower:
+        return {**_empty(), "ssl": detect_ssl(final_url)}
+
+    tags = _collect_tags(soup) if soup is not None else _stream_tags(html)
+    hits = _scan_indicators(html_lower)
 
     return {
-        "cms": detect_cms(html_lower, soup),
-        "cms_version": detect_cms_version(soup),
+        "cms": detect_cms(hits, tags["meta_name"]),
+        "cms_version": detect_cms_version(tags["meta_name"]),
         "ssl": detect_ssl(final_url),
-        "mobile_responsive": detect_mobile_responsive(soup),
-        "analytics": detect_analytics(html_lower, soup),
-        "jquery": detect_jquery(html_lower, soup),
-        "cookie_consent": detect_cookie_consent(html_lower, soup),
-        "social_links": detect_social_links(soup),
-        "page_bloat": detect_page_bloat(soup),
-        "og_tags": detect_og_tags(soup),
-        "favicon": detect_favicon(soup, html_lower),
+        "mobile_responsive": detect_mobile_responsive(tags["meta_name"]),
+        "analytics": detect_analytics(hits),
+        "jquery": detect_jquery(html_lower, hits),
+        "cookie_consent": detect_cookie_consent(hits),
+        "social_links": detect_social_links(tags["anchor_hrefs"]),
+        "page_bloat": detect_page_bloat(tags["external_scripts"], tags["external_stylesheets"]),
+        "og_tags": detect_og_tags(tags["meta_property"]),
+        "favicon": detect_favicon(tags["link_rels"], hits),
         "detected": True,
     }
 
 
+class _TagCollector:
+    """Record the meta, link, anchor and script attributes the detectors need.
+
+    Works as an lxml parser target, so standalone calls see start-tag events
+    without building a tree, and is also fed from a shared soup. Metas map
+    name/property to content (first occurrence wins, as with ``soup.find``).
+    External scripts and stylesheets are counted as they go past.
+    """
+
+    def __init__(self) -> None:
+        self.meta_name: Dict[str, str] = {}
+        self.meta_property: Dict[str, str] = {}
+        self.link_rels: List[str] = []
+        self.anchor_hrefs: List[str] = []
+        self.external_scripts = 0
+        self.external_stylesheets = 0
+
+    def start(self, tag: str, attrib: Dict[str, Any]) -> None:
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                self.anchor_hrefs.append(href.lower())
+        elif tag == "script":
+            if (attrib.get("src") or "").startswith(_EXTERNAL_PREFIXES):
+                self.external_scripts += 1
+        elif tag == "link":
+            rel = attrib.get("rel") or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            self.link_rels.append(" ".join(rel))
+            if "stylesheet" in rel and (attrib.get("href") or "").startswith(_EXTERNAL_PREFIXES):
+                self.external_stylesheets += 1
+        elif tag == "meta":
+            content = attrib.get("content", "") or ""
+            if attrib.get("name") is not None:
+                self.meta_name.setdefault(attrib["name"], content)
+            if attrib.get("property") is not None:
+                self.meta_property.setdefault(attrib["property"], content)
+
+    def close(self) -> Dict[str, Any]:
+        return {
+            "meta_name": self.meta_name,
+            "meta_property": self.meta_property,
+            "link_rels": self.link_rels,
+            "anchor_hrefs": self.anchor_hrefs,
+            "external_scripts": self.external_scripts,
+            "external_stylesheets": self.external_stylesheets,
+        }
+
+
+def _collect_tags(soup: BeautifulSoup) -> Dict[str, Any]:
+    collector = _TagCollector()
+    for tag in soup.find_all(["meta", "link", "a", "script"]):
+        collector.start(tag.name, tag.attrs)
+    return collector.close()
+
+
+def _stream_tags(html: str) -> Dict[str, Any]:
+    parser = etree.HTMLParser(target=_TagCollector())
+    parser.feed(html)
+    return parser.close()
+
+
 def _empty() -> Dict[str, Any]:
     return {
         "cms": {"name": "Unknown", "confidence": "low"},
@@ -46,26 +255,13 @@ def _empty() -> Dict[str, Any]:
     }
 
 
-def detect_cms(html_lower: str, soup: BeautifulSoup) -> Dict[str, Any]:
-    checks = [
-        (["wp-content", "wp-includes"], "WordPress", "high"),
-        (["wix.com", "wixsite.com", "_wix_browser_sess"], "Wix", "high"),
-        (["squarespace.com", "squarespace-cdn.com"], "Squarespace", "high"),
-        (["cdn.shopify.com", "shopify"], "Shopify", "high"),
-        (["webflow.com"], "Webflow", "medium"),
-        (["/media/jui/", "joomla"], "Joomla", "medium"),
-        (["drupal", "/sites/default/files", "/misc/drupal.js"], "Drupal", "medium"),
-        (["ghost.io", "ghost-"], "Ghost", "medium"),
-        (["weebly.com"], "Weebly", "high"),
-        (["godaddy"], "GoDaddy", "medium"),
-    ]
-    for indicators, name, confidence in checks:
-        if any(i in html_lower for i in indicators):
+def detect_cms(hits: Set[str], meta_name: Dict[str, str]) -> Dict[str, Any]:
+    for indicator, name, confidence in _CMS_INDICATORS:
+        if indicator in hits:
             return {"name": name, "confidence": confidence}
 
-    generator = soup.find("meta", attrs={"name": "generator"})
-    if generator:
-        gc = (generator.get("content", "") or "").lower()
+    if "generator" in meta_name:
+        gc = meta_name["generator"].lower()
         for kw, name in [("wordpress", "WordPress"), ("joomla", "Joomla"), ("drupal", "Drupal"), ("wix", "Wix"), ("squarespace", "Squarespace")]:
             if kw in gc:
                 return {"name": name, "confidence": "high"}
@@ -75,13 +271,36 @@ def detect_cms(html_lower: str, soup: BeautifulSoup) -> Dict[str, Any]:
     return {"name": "Custom/Unknown", "confidence": "low"}
 
 
-def detect_cms_version(soup: BeautifulSoup) -> Optional[str]:
-    gen = soup.find("meta", attrs={"name": "generator"})
-    if gen:
-        content = gen.get("content", "") or ""
-        m = re.search(r"[\d]+\.[\d]+(?:\.[\d]+)?", content)
-        if m:
-            return m.group(0)
+def detect_cms_version(meta_name: Dict[str, str]) -> Optional[str]:
+    return _extract_version(meta_name.get("generator", ""))
+
+
+def _digit_run_end(s: str, i: int) -> int:
+    n = len(s)
+    while i < n and s[i].isdecimal():
+        i += 1
+    return i
+
+
+def _extract_version(s: str) -> Optional[str]:
+    """Return the first ``major.minor[.patch]`` run in ``s``, or None.
+
+    Same result as ``re.search(r"\\d+\\.\\d+(?:\\.\\d+)?", s)``, but the scan
+    jumps between dots with ``str.find`` and only walks the digits around them.
+    """
+    dot = s.find(".")
+    while dot != -1:
+        end = _digit_run_end(s, dot + 1)
+        if end > dot + 1 and dot and s[dot - 1].isdecimal():
+            start = dot - 1
+            while start and s[start - 1].isdecimal():
+                start -= 1
+            if s.startswith(".", end):
+                patch_end = _digit_run_end(s, end + 1)
+                if patch_end > end + 1:
+                    end = patch_end
+            return s[start:end]
+        dot = s.find(".", dot + 1)
     return None
 
 
@@ -89,165 +308,202 @@ def detect_ssl(final_url: str) -> bool:
     return final_url.lower().startswith("https://")
 
 
-def detect_mobile_responsive(soup: BeautifulSoup) -> bool:
-    return soup.find("meta", attrs={"name": "viewport"}) is not None
+def detect_mobile_responsive(meta_name: Dict[str, str]) -> bool:
+    return "viewport" in meta_name
 
 
-def detect_analytics(html_lower: str, soup: BeautifulSoup) -> Dict[str, Any]:
+def detect_analytics(hits: Set[str]) -> Dict[str, Any]:
     result: Dict[str, Any] = {"google_analytics": False, "meta_pixel": False, "other": []}
-    if any(s in html_lower for s in ["gtag(", "googletagmanager.com", "google-analytics.com", "ga("]):
+    if any(s in hits for s in _GA_INDICATORS):
         result["google_analytics"] = True
-    if any(s in html_lower for s in ["connect.facebook.net", "fbq(", "facebook.com/tr"]):
+    if any(s in hits for s in _META_PIXEL_INDICATORS):
         result["meta_pixel"] = True
-    for indicator, name in [("hotjar.com", "Hotjar"), ("clarity.ms", "Microsoft Clarity"), ("plausible.io", "Plausible"), ("matomo", "Matomo"), ("mixpanel.com", "Mixpanel"), ("segment.com", "Segment")]:
-        if indicator in html_lower:
+    for indicator, name in _OTHER_ANALYTICS:
+        if indicator in hits:
             result["other"].append(name)
     return result
 
 
-def detect_jquery(html_lower: str, soup: BeautifulSoup) -> Dict[str, Any]:
+def detect_jquery(html_lower: str, hits: Set[str]) -> Dict[str, Any]:
     result: Dict[str, Any] = {"present": False, "version": None}
-    if "jquery" in html_lower:
+    if "jquery" in hits:
         result["present"] = True
-        for pattern in [r"jquery[.-](\d+\.\d+(?:\.\d+)?)", r"jquery\.min\.js\?ver=(\d+\.\d+(?:\.\d+)?)", r"jQuery\s+v?(\d+\.\d+(?:\.\d+)?)"]:
-            m = re.search(pattern, html_lower)
-            if m:
-                result["version"] = m.group(1)
-                break
+        # Every pattern needs ".", "-" or whitespace (\s, so any Unicode
+        # space) right after "jquery"; other occurrences cannot match.
+        offsets = [
+            idx for idx in _token_offsets(html_lower, "jquery")
+            if (nxt := html_lower[idx + 6:idx + 7]) in (".", "-") or nxt.isspace()
+        ]
+        for pattern in _JQUERY_RES:
+            for idx in offsets:
+                m = pattern.match(html_lower, idx, idx + _JQUERY_WINDOW)
+                if m:
+                    result["version"] = m.group(1)
+                    return result
     return result
 
 
-def detect_cookie_consent(html_lower: str, soup: BeautifulSoup) -> bool:
-    indicators = [
-        "cookie-consent", "cookieconsent", "cookie-notice", "cookie-banner",
-        "cookie-popup", "gdpr-consent", "cc-banner", "cc-window",
-        "cookiebot", "osano", "onetrust", "termly", "iubenda",
-    ]
-    return any(i in html_lower for i in indicators)
+def _token_offsets(text: str, token: str) -> List[int]:
+    offsets = []
+    idx = text.find(token)
+    while idx != -1:
+        offsets.append(idx)
+        idx = text.find(token, idx + len(token))
+    return offsets
+
 
+def detect_cookie_consent(hits: Set[str]) -> bool:
+    return any(i in hits for i in _COOKIE_CONSENT_INDICATORS)
 
-def detect_social_links(soup: BeautifulSoup) -> Dict[str, bool]:
+
+def detect_social_links(anchor_hrefs: List[str]) -> Dict[str, bool]:
     social = {"facebook": False, "instagram": False, "linkedin": False, "twitter": False, "youtube": False, "tiktok": False}
-    for link in soup.find_all("a", href=True):
-        href = (link.get("href", "") or "").lower()
-        if "facebook.com" in href and "/tr" not in href and "sharer" not in href:
-            social["facebook"] = True
-        if "instagram.com" in href:
-            social["instagram"] = True
-        if "linkedin.com" in href and "share" not in href:
-            social["linkedin"] = True
-        if "twitter.com" in href or "x.com/" in href:
-            social["twitter"] = True
-        if "youtube.com" in href:
-            social["youtube"] = True
-        if "tiktok.com" in href:
-            social["tiktok"] = True
+    for href in anchor_hrefs:
+        for platform, needles, excluded in _SOCIAL_RULES:
+            if social[platform]:
+                continue
+            if any(n in href for n in needles) and not any(x in href for x in excluded):
+                social[platform] = True
+        if all(social.values()):
+            break
     return social
 
 
-def detect_page_bloat(soup: BeautifulSoup) -> Dict[str, int]:
-    ext_scripts = sum(1 for s in soup.find_all("script", src=True) if s.get("src", "").startswith(("http", "//")))
-    ext_css = sum(1 for l in soup.find_all("link", rel="stylesheet") if l.get("href", "").startswith(("http", "//")))
+def detect_page_bloat(ext_scripts: int, ext_css: int) -> Dict[str, int]:
     return {"external_scripts": ext_scripts, "external_stylesheets": ext_css, "total_external": ext_scripts + ext_css}
 
 
-def detect_og_tags(soup: BeautifulSoup) -> Dict[str, bool]:
+def detect_og_tags(meta_property: Dict[str, str]) -> Dict[str, bool]:
     return {
-        "has_og_title": soup.find("meta", attrs={"property": "og:title"}) is not None,
-        "has_og_image": soup.find("meta", attrs={"property": "og:image"}) is not None,
+        "has_og_title": "og:title" in meta_property,
+        "has_og_image": "og:image" in meta_property,
     }
 
 
-def detect_favicon(soup: BeautifulSoup, html_lower: str) -> bool:
-    if soup.find("link", rel=re.compile(r"icon|shortcut", re.I)):
+def detect_favicon(link_rels: List[str], hits: Set[str]) -> bool:
+    if any(_FAVICON_REL_RE.search(rel) for rel in link_rels):
         return True
-    return "favicon" in html_lower
+    return "favicon" in hits
+
+
+def _major(version: str) -> Optional[int]:
+    head, _, _ = version.partition(".")
+    return int(head) if head.isdecimal() else None
+
+
+_HealthEntry = Optional[Tuple[str, str, str]]
+
+
+def _ssl_health(t: Dict[str, Any]) -> _HealthEntry:
+    if t.get("ssl"):
+        return "green", "HTTPS", "SSL secured"
+    return "red", "No SSL", "Not using HTTPS"
+
+
+def _responsive_health(t: Dict[str, Any]) -> _HealthEntry:
+    if t.get("mobile_responsive"):
+        return "green", "Responsive", "Mobile-friendly"
+    return "red", "Not Responsive", "No viewport meta"
+
+
+def _cms_health(t: Dict[str, Any]) -> _HealthEntry:
+    cms_name = t.get("cms", {}).get("name", "Unknown")
+    if cms_name in ("Custom/Unknown", "Unknown"):
+        return None
+    cms_version = t.get("cms_version")
+    major = _major(cms_version) if cms_version else None
+    if major is None:
+        return "green", cms_name, "CMS detected"
+    if cms_name == "WordPress" and major < 6:
+        return "amber", f"{cms_name} {cms_version}", "Older version"
+    return "green", f"{cms_name} {cms_version}", "CMS detected"
+
+
+def _analytics_health(t: Dict[str, Any]) -> _HealthEntry:
+    analytics = t.get("analytics", {})
+    parts = []
+    if analytics.get("google_analytics"):
+        parts.append("GA")
+    if analytics.get("meta_pixel"):
+        parts.append("Meta Pixel")
+    parts.extend(analytics.get("other", []))
+    if parts:
+        return "green", "Analytics", ", ".join(parts[:3])
+    return "red", "No Analytics", "No tracking detected"
+
+
+def _jquery_health(t: Dict[str, Any]) -> _HealthEntry:
+    jquery = t.get("jquery", {})
+    if not jquery.get("present"):
+        return None
+    version = jquery.get("version")
+    major = _major(version) if version else None
+    if major is None:
+        return "amber", "jQuery", "Version unknown"
+    if major < 3:
+        return "amber", f"jQuery {version}", "Older version"
+    return "green", f"jQuery {version}", "Current version"
+
+
+def _og_health(t: Dict[str, Any]) -> _HealthEntry:
+    og = t.get("og_tags", {})
+    has_title, has_image = og.get("has_og_title"), og.get("has_og_image")
+    if has_title and has_image:
+        return "green", "OG Tags", "Social sharing optimised"
+    if has_title or has_image:
+        return "amber", "Partial OG", "Incomplete social tags"
+    return "amber", "No OG Tags", "Poor social sharing"
+
+
+def _favicon_health(t: Dict[str, Any]) -> _HealthEntry:
+    if t.get("favicon"):
+        return "green", "Favicon", "Browser icon present"
+    return "red", "No Favicon", "Missing browser icon"
+
+
+def _cookie_consent_health(t: Dict[str, Any]) -> _HealthEntry:
+    if t.get("cookie_consent"):
+        return "green", "Cookie Consent", "GDPR compliance"
+    return None
+
+
+def _social_health(t: Dict[str, Any]) -> _HealthEntry:
+    active = sum(1 for v in t.get("social_links", {}).values() if v)
+    if active >= 3:
+        return "green", "Social Links", f"{active} platforms"
+    if active >= 1:
+        return "amber", "Limited Social", f"Only {active} platform(s)"
+    return None
+
+
+def _bloat_health(t: Dict[str, Any]) -> _HealthEntry:
+    total = t.get("page_bloat", {}).get("total_external", 0)
+    if total > 30:
+        return "amber", "Page Bloat", f"{total} external resources"
+    return None
+
+
+# Each rule yields at most one (bucket, label, detail) entry; list order is
+# the display order within each bucket.
+_TECH_HEALTH_RULES = [
+    _ssl_health,
+    _responsive_health,
+    _cms_health,
+    _analytics_health,
+    _jquery_health,
+    _og_health,
+    _favicon_health,
+    _cookie_consent_health,
+    _social_health,
+    _bloat_health,
+]
 
 
 def classify_tech_health(technographics: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
-    green: List[Dict[str, str]] = []
-    amber: List[Dict[str, str]] = []
-    red: List[Dict[str, str]] = []
-
-    if technographics.get("ssl"):
-        green.append({"label": "HTTPS", "detail": "SSL secured"})
-    else:
-        red.append({"label": "No SSL", "detail": "Not using HTTPS"})
-
-    if technographics.get("mobile_responsive"):
-        green.append({"label": "Responsive", "detail": "Mobile-friendly"})
-    else:
-        red.append({"label": "Not Responsive", "detail": "No viewport meta"})
-
-    cms = technographics.get("cms", {})
-    cms_name = cms.get("name", "Unknown")
-    cms_version = technographics.get("cms_version")
-    if cms_name not in ("Custom/Unknown", "Unknown"):
-        if cms_version:
-            try:
-                major = int(cms_version.split(".")[0])
-                if cms_name == "WordPress" and major < 6:
-                    amber.append({"label": f"{cms_name} {cms_version}", "detail": "Older version"})
-                else:
-                    green.append({"label": f"{cms_name} {cms_version}", "detail": "CMS detected"})
-            except (ValueError, IndexError):
-                green.append({"label": cms_name, "detail": "CMS detected"})
-        else:
-            green.append({"label": cms_name, "detail": "CMS detected"})
-
-    analytics = technographics.get("analytics", {})
-    has_analytics = analytics.get("google_analytics") or analytics.get("meta_pixel") or len(analytics.get("other", [])) > 0
-    if has_analytics:
-        parts = []
-        if analytics.get("google_analytics"):
-            parts.append("GA")
-        if analytics.get("meta_pixel"):
-            parts.append("Meta Pixel")
-        parts.extend(analytics.get("other", []))
-        green.append({"label": "Analytics", "detail": ", ".join(parts[:3])})
-    else:
-        red.append({"label": "No Analytics", "detail": "No tracking detected"})
-
-    jquery = technographics.get("jquery", {})
-    if jquery.get("present"):
-        version = jquery.get("version")
-        if version:
-            try:
-                major = int(version.split(".")[0])
-                if major < 3:
-                    amber.append({"label": f"jQuery {version}", "detail": "Older version"})
-                else:
-                    green.append({"label": f"jQuery {version}", "detail": "Current version"})
-            except (ValueError, IndexError):
-                amber.append({"label": "jQuery", "detail": "Version unknown"})
-        else:
-            amber.append({"label": "jQuery", "detail": "Version unknown"})
-
-    og = technographics.get("og_tags", {})
-    if og.get("has_og_title") and og.get("has_og_image"):
-        green.append({"label": "OG Tags", "detail": "Social sharing optimised"})
-    elif og.get("has_og_title") or og.get("has_og_image"):
-        amber.append({"label": "Partial OG", "detail": "Incomplete social tags"})
-    else:
-        amber.append({"label": "No OG Tags", "detail": "Poor social sharing"})
-
-    if technographics.get("favicon"):
-        green.append({"label": "Favicon", "detail": "Browser icon present"})
-    else:
-        red.append({"label": "No Favicon", "detail": "Missing browser icon"})
-
-    if technographics.get("cookie_consent"):
-        green.append({"label": "Cookie Consent", "detail": "GDPR compliance"})
-
-    social = technographics.get("social_links", {})
-    active = [k for k, v in social.items() if v]
-    if len(active) >= 3:
-        green.append({"label": "Social Links", "detail": f"{len(active)} platforms"})
-    elif len(active) >= 1:
-        amber.append({"label": "Limited Social", "detail": f"Only {len(active)} platform(s)"})
-
-    bloat = technographics.get("page_bloat", {})
-    if bloat.get("total_external", 0) > 30:
-        amber.append({"label": "Page Bloat", "detail": f"{bloat['total_external']} external resources"})
-
-    return {"green": green, "amber": amber, "red": red}
+    buckets: Dict[str, List[Dict[str, str]]] = {"green": [], "amber": [], "red": []}
+    for rule in _TECH_HEALTH_RULES:
+        entry = rule(technographics)
+        if entry is not None:
+            bucket, label, detail = entry
+            buckets[bucket].append({"label": label, "detail": detail})
+    return buckets